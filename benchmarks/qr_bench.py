@@ -0,0 +1,389 @@
+"""
+QR rendering benchmarks.
+
+Times each stage of QR rendering (encode, rasterize, watermark, encoders), the legacy
+qrcode/RGBA pipeline for comparison, and end-to-end requests through the ASGI app.
+
+Usage:
+    python -m benchmarks.qr_bench                       # full grid
+    python -m benchmarks.qr_bench --quick               # smaller grid, fewer rounds
+    python -m benchmarks.qr_bench -k e2e                # only benchmarks whose name contains "e2e"
+    python -m benchmarks.qr_bench --save baseline.json  # write a baseline
+    python -m benchmarks.qr_bench --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import qrcode
+from PIL import Image
+
+from src.app.core.config import ExecutorMode, settings
+from src.app.services.qr_service import QRFormat, QRService, WatermarkCache, encode_matrix, rasterize, render_qr
+
+ERROR_LEVELS: dict[str, int] = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+PAYLOAD_LENGTHS: tuple[int, ...] = (16, 128, 512)
+BOX_SIZES: tuple[int, ...] = (5, 10, 20)
+
+# Set from --filter; benchmarks whose name does not contain it are skipped
+_name_filter: Optional[str] = None
+
+
+###########################################
+# Measurement
+###########################################
+@dataclass
+class BenchResult:
+    name: str
+    params: dict[str, Any]
+    rounds: int
+    min_us: float
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    ops_per_sec: float
+    alloc_peak_kib: float
+    samples_us: list[float] = field(default_factory=list, repr=False)
+
+
+def _percentile(sorted_samples: list[float], percentile: float) -> float:
+    index = max(0, math.ceil(percentile / 100 * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+def _summarize(name: str, params: dict[str, Any], samples_ns: list[int], alloc_peak: int) -> BenchResult:
+    samples_us = sorted(sample / 1000 for sample in samples_ns)
+    mean_us = statistics.fmean(samples_us)
+    return BenchResult(
+        name=name,
+        params=params,
+        rounds=len(samples_us),
+        min_us=samples_us[0],
+        mean_us=mean_us,
+        p50_us=_percentile(samples_us, 50),
+        p99_us=_percentile(samples_us, 99),
+        ops_per_sec=1_000_000 / mean_us if mean_us else 0.0,
+        alloc_peak_kib=alloc_peak / 1024,
+        samples_us=samples_us,
+    )
+
+
+def bench(
+    name: str,
+    fn: Callable[[], object],
+    *,
+    rounds: int,
+    warmup: int = 3,
+    setup: Optional[Callable[[], object]] = None,
+    **params: Any,
+) -> Optional[BenchResult]:
+    """Time `fn` over `rounds` calls; `setup` runs untimed before every call."""
+
+    if _name_filter and _name_filter not in name:
+        return None
+
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    samples: list[int] = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+
+    # Allocations are measured in a separate pass; tracing would distort the timings
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return _summarize(name, params, samples, peak)
+
+
+async def abench(name: str, fn: Callable[[], Awaitable[object]], *, rounds: int, warmup: int = 3, **params: Any) -> Optional[BenchResult]:
+    if _name_filter and _name_filter not in name:
+        return None
+
+    for _ in range(warmup):
+        await fn()
+
+    samples: list[int] = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        await fn()
+        samples.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return _summarize(name, params, samples, peak)
+
+
+###########################################
+# Stage benchmarks
+###########################################
+def _payload(length: int) -> str:
+    prefix = "https://resume.venibren.dev/?q="
+    return (prefix + "x" * length)[: max(length, len(prefix))]
+
+
+def encode_benchmarks(rounds: int, payload_lengths: tuple[int, ...]) -> list[Optional[BenchResult]]:
+    results = []
+    for length in payload_lengths:
+        data = _payload(length)
+        for level_name, level in ERROR_LEVELS.items():
+            # Bypass the memoization to time the actual Reed-Solomon encode and mask selection
+            results.append(bench(f"encode[{length}-{level_name}]", lambda: encode_matrix.__wrapped__(data, level), rounds=rounds, payload=length, level=level_name))
+
+            def legacy_encode() -> None:
+                qr = qrcode.QRCode(version=1, error_correction=level, border=0)
+                qr.add_data(data)
+                qr.make(fit=True)
+
+            results.append(bench(f"legacy_encode[{length}-{level_name}]", legacy_encode, rounds=rounds, payload=length, level=level_name))
+    return results
+
+
+def raster_benchmarks(rounds: int, payload_lengths: tuple[int, ...], box_sizes: tuple[int, ...]) -> list[Optional[BenchResult]]:
+    results = []
+    watermark_path = settings.qr_watermark_path
+
+    with Image.open(watermark_path) as source:
+        watermark_source = source.convert("RGBA")
+
+    for length in payload_lengths:
+        data = _payload(length)
+        matrix = encode_matrix(data)
+
+        for box in box_sizes:
+            params = {"payload": length, "box": box}
+            suffix = f"[{length}-{box}]"
+            border = math.ceil(box / 5)
+
+            # Current pipeline
+            results.append(bench(f"rasterize{suffix}", lambda: rasterize(matrix, box, border), rounds=rounds, **params))
+
+            service = QRService(size=box)
+            service.generate(data)
+            watermark_size = service.pixel_size // 4
+            cold_cache = WatermarkCache(max_entries=1)
+
+            def reset_watermarks() -> None:
+                cold_cache.clear()
+                cold_cache.preload(watermark_path)
+
+            results.append(
+                bench(
+                    f"watermark_resize{suffix}",
+                    lambda: cold_cache.get(watermark_path, (watermark_size, watermark_size), service.background_color),
+                    rounds=rounds,
+                    setup=reset_watermarks,
+                    **params,
+                )
+            )
+
+            service.add_watermark(watermark_path)
+
+            def watermark_paste() -> None:
+                service._qr_image = None
+                service.qr_image
+
+            results.append(bench(f"watermark_paste{suffix}", watermark_paste, rounds=rounds, **params))
+            results.append(bench(f"png_save{suffix}", lambda: service.to_bytes(QRFormat.PNG), rounds=rounds, **params))
+            results.append(bench(f"webp_save{suffix}", lambda: service.to_bytes(QRFormat.WEBP), rounds=rounds, **params))
+            results.append(bench(f"svg_build{suffix}", lambda: service.to_bytes(QRFormat.SVG), rounds=rounds, **params))
+            results.append(bench(f"render_png{suffix}", lambda: render_qr(data, watermark_path, size=box), rounds=rounds, **params))
+
+            # Legacy pipeline: qrcode image -> RGBA -> per-request LANCZOS resize -> paste -> PNG
+            qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_H, box_size=box, border=border)
+            qr.add_data(data)
+            qr.make(fit=True)
+            legacy_image = qr.make_image(back_color="#ffffff", fill_color="#000000")
+            legacy_rgba = legacy_image.convert("RGBA")
+            legacy_size = (legacy_rgba.size[0] // 4, legacy_rgba.size[1] // 4)
+            legacy_watermark = watermark_source.resize(legacy_size, Image.Resampling.LANCZOS)
+            legacy_mask = legacy_watermark.split()[3]
+            position = ((legacy_rgba.size[0] - legacy_size[0]) // 2, (legacy_rgba.size[1] - legacy_size[1]) // 2)
+
+            def legacy_paste() -> None:
+                canvas = legacy_rgba.copy()
+                background = Image.new("RGBA", legacy_size, "#ffffff")
+                canvas.paste(background, position, background)
+                canvas.paste(legacy_watermark, position, legacy_mask)
+
+            def legacy_save() -> None:
+                legacy_rgba.save(io.BytesIO(), format="png")
+
+            results.append(bench(f"legacy_make_image{suffix}", lambda: qr.make_image(back_color="#ffffff", fill_color="#000000"), rounds=rounds, **params))
+            results.append(bench(f"legacy_convert_rgba{suffix}", lambda: legacy_image.convert("RGBA"), rounds=rounds, **params))
+            results.append(bench(f"legacy_watermark_resize{suffix}", lambda: watermark_source.resize(legacy_size, Image.Resampling.LANCZOS), rounds=rounds, **params))
+            results.append(bench(f"legacy_paste{suffix}", legacy_paste, rounds=rounds, **params))
+            results.append(bench(f"legacy_png_save{suffix}", legacy_save, rounds=rounds, **params))
+    return results
+
+
+###########################################
+# End-to-end benchmarks
+###########################################
+async def _e2e_benchmarks(rounds: int) -> list[Optional[BenchResult]]:
+    import httpx
+
+    from src.app.api.v1.qr_generator import qr_render_cache
+    from src.app.core.executor import render_executor
+    from src.main import app
+
+    # Render on the loop so timings reflect the handler rather than pool start-up
+    render_executor.mode = ExecutorMode.INLINE
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = 0
+
+        async def cold() -> None:
+            nonlocal counter
+            counter += 1
+            response = await client.get("/v1/qr-code", params={"url": f"https://resume.venibren.dev/{counter}"})
+            response.raise_for_status()
+
+        async def warm() -> None:
+            response = await client.get("/v1/qr-code")
+            response.raise_for_status()
+
+        response = await client.get("/v1/qr-code")
+        response.raise_for_status()
+        etag = response.headers["etag"]
+
+        async def not_modified() -> None:
+            response = await client.get("/v1/qr-code", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+
+        async def head() -> None:
+            response = await client.head("/v1/qr-code")
+            response.raise_for_status()
+
+        async def svg_cold() -> None:
+            nonlocal counter
+            counter += 1
+            response = await client.get("/v1/qr-code", params={"url": f"https://resume.venibren.dev/{counter}", "format": "svg"})
+            response.raise_for_status()
+
+        results.append(await abench("e2e_get_cold", cold, rounds=rounds))
+        results.append(await abench("e2e_get_warm", warm, rounds=rounds))
+        results.append(await abench("e2e_get_304", not_modified, rounds=rounds))
+        results.append(await abench("e2e_head_warm", head, rounds=rounds))
+        results.append(await abench("e2e_svg_cold", svg_cold, rounds=rounds))
+
+    qr_render_cache.clear()
+    return results
+
+
+def e2e_benchmarks(rounds: int) -> list[Optional[BenchResult]]:
+    return asyncio.run(_e2e_benchmarks(rounds))
+
+
+###########################################
+# Reporting
+###########################################
+def print_table(results: list[BenchResult]) -> None:
+    header = f"{'Name':<40} {'Min (us)':>11} {'Mean (us)':>11} {'P50 (us)':>11} {'P99 (us)':>11} {'OPS':>11} {'Peak KiB':>10} {'Rounds':>7}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.name:<40} {result.min_us:>11.1f} {result.mean_us:>11.1f} {result.p50_us:>11.1f} "
+            f"{result.p99_us:>11.1f} {result.ops_per_sec:>11.1f} {result.alloc_peak_kib:>10.1f} {result.rounds:>7}"
+        )
+
+
+def save_baseline(results: list[BenchResult], path: str) -> None:
+    document = {
+        "machine": {"python": sys.version, "platform": platform.platform(), "processor": platform.processor()},
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "benchmarks": [{key: value for key, value in asdict(result).items() if key != "samples_us"} for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+    print(f"\nSaved baseline with {len(results)} benchmarks to {path}")
+
+
+def compare_baseline(results: list[BenchResult], path: str, threshold: float) -> int:
+    """Print p50 changes against a baseline; returns the number of regressions beyond `threshold`."""
+
+    with open(path, encoding="utf-8") as file:
+        baseline = {entry["name"]: entry for entry in json.load(file)["benchmarks"]}
+
+    regressions = 0
+    print(f"\nComparison against {path} (p50, regression threshold {threshold:.0%})")
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None or not previous["p50_us"]:
+            continue
+        ratio = result.p50_us / previous["p50_us"]
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            marker = "  improved"
+        print(f"{result.name:<40} {previous['p50_us']:>11.1f} -> {result.p50_us:>11.1f} us ({ratio:>6.2f}x){marker}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="QR rendering benchmarks")
+    parser.add_argument("-k", "--filter", default=None, help="Only run benchmarks whose name contains this substring")
+    parser.add_argument("--rounds", type=int, default=None, help="Timed rounds per benchmark")
+    parser.add_argument("--quick", action="store_true", help="Smaller parameter grid and fewer rounds")
+    parser.add_argument("--skip-e2e", action="store_true", help="Skip end-to-end ASGI benchmarks")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare results with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative p50 slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    global _name_filter
+    _name_filter = args.filter
+
+    rounds = args.rounds or (20 if args.quick else 100)
+    payload_lengths = PAYLOAD_LENGTHS[:2] if args.quick else PAYLOAD_LENGTHS
+    box_sizes = (10,) if args.quick else BOX_SIZES
+
+    collected = encode_benchmarks(rounds, payload_lengths) + raster_benchmarks(rounds, payload_lengths, box_sizes)
+    if not args.skip_e2e:
+        collected += e2e_benchmarks(rounds)
+    results = [result for result in collected if result is not None]
+
+    print_table(results)
+
+    if args.save:
+        save_baseline(results, args.save)
+    if args.compare:
+        return 1 if compare_baseline(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
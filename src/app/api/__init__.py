@@ -10,6 +10,7 @@ from strawberry.fastapi import GraphQLRouter as StrawberryGraphQLRouter
 from strawberry.tools import merge_types
 
 from src.app.core.logger import get_logger
+from src.app.core.response_cache import apply_router_policy
 
 _logger = get_logger(__name__)
 
@@ -168,6 +169,8 @@ for source_file in _package_path.rglob("*.py"):
     if module_rest_router is not None:
         rest_version: Optional[str] = _infer_version(relative_parts)
         try:
+            # Routers opted into response caching with cache_router() pass the policy to their GET routes
+            apply_router_policy(module_rest_router)
             api_router.include_router(
                 module_rest_router,
                 prefix=f"/{rest_version}" if rest_version else "",
@@ -0,0 +1,18 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db import async_get_reader_db, async_get_writer_db
+from ..repositories import UserRepository
+
+
+# Repository for read-only endpoints; may be served by a replica
+def get_user_reader_repository(session: AsyncSession = Depends(async_get_reader_db)) -> UserRepository:
+    return UserRepository(session)
+
+
+# Repository on the primary for endpoints that write
+def get_user_writer_repository(session: AsyncSession = Depends(async_get_writer_db)) -> UserRepository:
+    return UserRepository(session)
+
+
+__all__ = ["get_user_reader_repository", "get_user_writer_repository"]
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, Response, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Response, status
+from fastapi.responses import JSONResponse
 
 from src.app.core.logger import get_logger, LoggingRoute
-from src.app.core.db import async_get_db, check_database_health
+from src.app.core.db import database_prober, pool_usage
+from ..schemas.health import DatabaseHealthSchema, PoolUsageSchema, ReadinessSchema
 
 _logger = get_logger(__name__)
 
@@ -25,10 +26,67 @@ router = APIRouter(
         503: {"description": "Service is not healthy"},
     },
 )
-async def get_health(db: AsyncSession = Depends(async_get_db)) -> Response:
-    """Health probe; returns 204 with an empty body."""
+async def get_health() -> Response:
+    """Health probe; answered from the background prober's latest result."""
 
-    db_alive = await check_database_health(db)
+    db_alive = database_prober.healthy
     _logger.verbose("Database Alive: %s", db_alive)
 
+    return Response(status_code=status.HTTP_204_NO_CONTENT if db_alive else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@router.get(
+    path="/live",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Liveness Check",
+    description="Returns 204 No Content while the process is serving requests; never touches dependencies.",
+    operation_id="getLiveness",
+    responses={204: {"description": "Process is alive"}},
+)
+async def get_liveness() -> Response:
+    """Liveness probe; a failing dependency must not get the process restarted."""
+
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    path="/ready",
+    status_code=status.HTTP_200_OK,
+    summary="Readiness Check",
+    description="Database status and pool saturation from the background prober; 503 when the database is down.",
+    operation_id="getReadiness",
+    response_model=ReadinessSchema,
+    responses={
+        200: {"description": "Ready to receive traffic"},
+        503: {"model": ReadinessSchema, "description": "Database is unreachable"},
+    },
+)
+async def get_readiness() -> JSONResponse:
+    """Readiness probe; answered from memory."""
+
+    database = database_prober.status
+    age = database.age
+    usage = pool_usage()
+    ready = database_prober.healthy
+
+    readiness = ReadinessSchema(
+        ready=ready,
+        database=DatabaseHealthSchema(
+            healthy=ready,
+            checked_seconds_ago=round(age, 3) if age is not None else None,
+            latency_ms=round(database.latency_ms, 3) if database.latency_ms is not None else None,
+            error=database.error,
+        ),
+        pool=PoolUsageSchema(
+            size=usage.size,
+            checked_out=usage.checked_out,
+            overflow=usage.overflow,
+            capacity=usage.capacity,
+            saturation=round(usage.saturation, 4) if usage.saturation is not None else None,
+        ),
+    )
+
+    return JSONResponse(
+        content=readiness.model_dump(by_alias=True),
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response, status
+
+from src.app.core.metrics import metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+)
+
+
+@router.get(
+    path="",
+    status_code=status.HTTP_200_OK,
+    summary="Metrics",
+    description="Per-worker metrics in the Prometheus text exposition format.",
+    operation_id="getMetrics",
+    response_class=Response,
+    responses={200: {"content": {"text/plain": {}}, "description": "Metrics exposition"}},
+)
+async def get_metrics() -> Response:
+    """Scrape endpoint; not wrapped in LoggingRoute so scrapes do not show up in request metrics."""
+
+    return Response(content=metrics.render(), media_type=metrics.content_type)
@@ -1,54 +1,555 @@
-from fastapi import APIRouter, status
+import asyncio
+import json
+import re
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
 from fastapi.responses import StreamingResponse
+from pydantic import Field, ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
 
-from src.app.core.logger import get_logger, LoggingRoute
+from src.app.core.config import settings
+from src.app.core.executor import ExecutorQueueFullError, render_executor
+from src.app.core.logger import get_logger
+from src.app.core.metrics import metrics
+from src.app.core.response_cache import cache_response, purge_responses
+from src.app.core.singleflight import SingleFlightRoute
+from src.app.core.timing import timed
 from ...schemas.base_schema import BaseSchema
-from ...services.qr_service import QRService
+from ...services.binary_response import BinaryResponse
+from ...services.qr_service import QRFormat, parse_color, render_qr, watermark_version
+from ...services.render_cache import RenderCache, etag_matches, make_etag, make_render_key
+from ...services.zip_stream import ZipStreamWriter
 
 _logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/qr-code",
     tags=["QR Code"],
-    route_class=LoggingRoute,
+    # Concurrent identical GETs for a code that is not cached yet share one render
+    route_class=SingleFlightRoute,
+)
+
+# Rendered image bytes shared by every request on this worker
+qr_render_cache = RenderCache(
+    max_entries=settings.qr_cache_max_entries,
+    max_bytes=settings.qr_cache_max_bytes,
 )
 
+metrics.callback("qr_render_cache_hits_total", "QR render cache hits", lambda: qr_render_cache.stats().hits, type_name="counter")
+metrics.callback("qr_render_cache_misses_total", "QR render cache misses", lambda: qr_render_cache.stats().misses, type_name="counter")
+metrics.callback("qr_render_cache_evictions_total", "QR render cache evictions", lambda: qr_render_cache.stats().evictions, type_name="counter")
+metrics.callback("qr_render_cache_bytes", "Bytes held by the QR render cache", lambda: qr_render_cache.stats().size_bytes)
+
+_DEFAULT_BACKGROUND_COLOR = "#ffffff"
+_DEFAULT_FILL_COLOR = "#000000"
+_MIN_SIZE = 1
+_MAX_SIZE = 50
+
+_NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+_BATCH_RETRY_DELAY = 0.05
+_BATCH_RETRY_ATTEMPTS = 20
+# Bytes that change the JSON array scanner's state outside and inside strings
+_JSON_STRUCTURE = re.compile(rb'[\[\]{}",]')
+_JSON_STRING_END = re.compile(rb'["\\]')
+
 
 class QRRequestBody(BaseSchema):
     url: str = "https://resume.venibren.dev"
     background_color: str | None = None
     fill_color: str | None = None
-    size: int = 10
+    size: int = Field(default=10, ge=_MIN_SIZE, le=_MAX_SIZE)
+    format: QRFormat | None = None
 
 
-@router.get(path="", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
-async def get_qr(
-    url: str = "https://resume.venibren.dev",
-    background_color: str | None = None,
-    fill_color: str | None = None,
-    size: int = 10,
-) -> StreamingResponse:
+def _negotiate_format(accept: str | None) -> QRFormat | None:
+    """
+    Pick the output format from an Accept header.
+    The most specific matching media range sets each format's q-value; ties favor enum order (PNG first).
+    """
+
+    if not accept:
+        return QRFormat.PNG
+
+    ranges: list[tuple[str, float]] = []
+    for media_range in accept.split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((media_type.lower(), quality))
+
+    best_format, best_quality = None, 0.0
+    for qr_format in QRFormat:
+        specificity, quality = -1, 0.0
+        for media_type, range_quality in ranges:
+            if media_type == qr_format.media_type:
+                rank = 2
+            elif media_type == "image/*":
+                rank = 1
+            elif media_type == "*/*":
+                rank = 0
+            else:
+                continue
+            if rank > specificity:
+                specificity, quality = rank, range_quality
+        if quality > best_quality:
+            best_format, best_quality = qr_format, quality
+
+    return best_format
+
+
+def _resolve_colors(background_color: str | None, fill_color: str | None) -> tuple[str, str]:
+    background_color = background_color or _DEFAULT_BACKGROUND_COLOR
+    fill_color = fill_color or _DEFAULT_FILL_COLOR
+    for color in (background_color, fill_color):
+        try:
+            parse_color(color)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"Unsupported color: {color}",
+            )
+    return background_color, fill_color
+
+
+# Last watermark version seen by this worker; a change purges QR responses stored with the old one
+_watermark_seen: tuple[int, int] | None = None
+
+
+def _current_watermark() -> tuple[int, int] | None:
+    global _watermark_seen
+
+    version = watermark_version(settings.qr_watermark_path)
+    if version != _watermark_seen:
+        if _watermark_seen is not None:
+            _logger.info("QR watermark changed, purging cached QR responses")
+            purge_responses("qr")
+        _watermark_seen = version
+    return version
+
+
+# Includes the watermark's mtime and size, so replacing the file changes both the cache key and the strong ETag
+def _render_key(url: str, background_color: str, fill_color: str, size: int, format: QRFormat) -> str:
+    return make_render_key(url, background_color, fill_color, size, settings.qr_watermark_path, _current_watermark(), format)
+
+
+async def _render_cached(
+    render_key: str,
+    url: str,
+    background_color: str,
+    fill_color: str,
+    size: int,
+    format: QRFormat,
+) -> tuple[bytes, bool]:
+    """Return the rendered payload and whether it came from the cache; may raise ExecutorQueueFullError."""
+
+    payload = qr_render_cache.get(render_key)
+    if payload is not None:
+        return payload, True
+
+    with timed("render", format):
+        payload = await render_executor.run(
+            render_qr,
+            url,
+            settings.qr_watermark_path,
+            background_color,
+            fill_color,
+            size,
+            format,
+        )
+    qr_render_cache.set(render_key, payload)
+    return payload, False
+
+
+async def _qr_response(
+    url: str,
+    background_color: str | None,
+    fill_color: str | None,
+    size: int,
+    format: QRFormat | None,
+    accept: str | None,
+    if_none_match: str | None,
+) -> Response:
     _logger.info("Generating QR code")
 
     _logger.silly(f"URL: {url}")
     _logger.silly(f"Background Color: {background_color}")
     _logger.silly(f"Fill Color: {fill_color}")
     _logger.silly(f"Size: {size}")
+    _logger.silly(f"Format: {format}")
+
+    # An explicit format wins over content negotiation
+    format = format or _negotiate_format(accept)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Supported media types: {', '.join(qr_format.media_type for qr_format in QRFormat)}",
+        )
+
+    background_color, fill_color = _resolve_colors(background_color, fill_color)
+
+    # Identical inputs always render identical bytes, so the key doubles as a strong ETag
+    render_key = _render_key(url, background_color, fill_color, size, format)
+    headers = {
+        "ETag": make_etag(render_key),
+        "Cache-Control": settings.qr_cache_control,
+        "Vary": "Accept",
+    }
+
+    if etag_matches(if_none_match, headers["ETag"]):
+        _logger.verbose("QR code not modified, returning 304")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    qr_service = QRService()
-    qr_service.generate(data=url)
-    qr_service.add_watermark("./src/assets/qr_watermark.png")
-    buffer = qr_service.to_buffer_stream()
+    try:
+        payload, cache_hit = await _render_cached(render_key, url, background_color, fill_color, size, format)
+    except ExecutorQueueFullError as ex:
+        _logger.warning("Rejecting QR render: %s", ex)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="QR renderer is busy, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    headers["X-Cache"] = "HIT" if cache_hit else "MISS"
 
-    _logger.verbose("Returning StreamingResponse with QR code image")
-    return StreamingResponse(buffer, media_type="image/png")
+    _logger.verbose("Returning BinaryResponse with QR code image")
+    return BinaryResponse(content=payload, media_type=format.media_type, headers=headers)
 
 
-@router.post(path="", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
-async def post_qr(data: QRRequestBody) -> StreamingResponse:
-    return await get_qr(
+# HEAD runs the same endpoint; a second documented operation would only duplicate GET's id
+@router.head(path="", response_class=BinaryResponse, include_in_schema=False)
+@router.get(
+    path="",
+    response_class=BinaryResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "content": {qr_format.media_type: {} for qr_format in QRFormat},
+            "description": "QR code image",
+        },
+        206: {"description": "Partial content for a Range request"},
+        304: {"description": "Not Modified"},
+        406: {"description": "No acceptable image format"},
+        503: {"description": "Renderer queue is full"},
+    },
+)
+# Repeats are answered before routing; stored for at most QR_RESPONSE_CACHE_TTL, since hits never see a watermark change
+@cache_response(surrogate_keys=("qr",), max_ttl=settings.qr_response_cache_ttl)
+async def get_qr(
+    url: str = "https://resume.venibren.dev",
+    background_color: str | None = None,
+    fill_color: str | None = None,
+    size: int = Query(default=10, ge=_MIN_SIZE, le=_MAX_SIZE),
+    format: QRFormat | None = None,
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    return await _qr_response(
+        url=url,
+        background_color=background_color,
+        fill_color=fill_color,
+        size=size,
+        format=format,
+        accept=accept,
+        if_none_match=if_none_match,
+    )
+
+
+@router.post(
+    path="",
+    response_class=BinaryResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "content": {qr_format.media_type: {} for qr_format in QRFormat},
+            "description": "QR code image",
+        },
+        206: {"description": "Partial content for a Range request"},
+        304: {"description": "Not Modified"},
+        406: {"description": "No acceptable image format"},
+        503: {"description": "Renderer queue is full"},
+    },
+)
+async def post_qr(
+    data: QRRequestBody,
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    return await _qr_response(
         url=data.url,
         background_color=data.background_color,
         fill_color=data.fill_color,
         size=data.size,
+        format=data.format,
+        accept=accept,
+        if_none_match=if_none_match,
+    )
+
+
+###########################################
+# Batch generation
+###########################################
+class _BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that may be sent while the request body is still being read.
+    Starlette's disconnect listener would otherwise consume the body messages, so a
+    disconnect is detected by the failing send instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
+
+
+# (index, item) or (index, validation errors)
+BatchItem = tuple[int, QRRequestBody | list[dict[str, Any]]]
+
+
+def _validate_batch_item(index: int, raw: Any) -> BatchItem:
+    try:
+        if isinstance(raw, (str, bytes)):
+            return index, QRRequestBody.model_validate_json(raw)
+        return index, QRRequestBody.model_validate(raw)
+    except ValidationError as ex:
+        return index, json.loads(ex.json(include_url=False))
+
+
+async def _iter_json_array_items(first: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[BatchItem]:
+    """
+    Split a JSON array into its elements as the body arrives and validate each one; only the element
+    being read is buffered. `first` is the first non-blank chunk, already checked to start with "[".
+    A body that turns out to be malformed (including a trailing comma or data after the closing
+    bracket) ends the batch with an error entry.
+    """
+
+    index = 0
+    element = bytearray()
+    depth = 0
+    in_string = False
+    escaped = False
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first[1:]
+        async for chunk in chunks:
+            yield chunk
+
+    stream = body()
+    async for chunk in stream:
+        position = 0
+        if escaped and chunk:
+            # The previous chunk ended on a backslash inside a string
+            element += chunk[:1]
+            position, escaped = 1, False
+
+        while position < len(chunk):
+            if in_string:
+                match = _JSON_STRING_END.search(chunk, position)
+                if match is None:
+                    element += chunk[position:]
+                    break
+                end = match.end()
+                if match.group() == b"\\":
+                    if end == len(chunk):
+                        element += chunk[position:]
+                        escaped = True
+                        break
+                    end += 1
+                else:
+                    in_string = False
+                element += chunk[position:end]
+                position = end
+                continue
+
+            match = _JSON_STRUCTURE.search(chunk, position)
+            if match is None:
+                element += chunk[position:]
+                break
+            start, byte = match.start(), match.group()
+
+            if depth == 0 and byte in (b",", b"]"):
+                element += chunk[position:start]
+                position = start + 1
+                if element.strip():
+                    yield _validate_batch_item(index, bytes(element))
+                    index += 1
+                elif byte == b"," or index:
+                    # "[,", "[1,,2]" and a trailing comma; only "[]" may close without an element
+                    yield index, "Malformed JSON array: empty element"
+                    return
+                element.clear()
+                if byte == b"]":
+                    # Only whitespace may follow; the rest of the body is read up to the first other byte
+                    trailing = chunk[position:].strip()
+                    if not trailing:
+                        async for rest in stream:
+                            trailing = rest.strip()
+                            if trailing:
+                                break
+                    if trailing:
+                        yield index, "Malformed JSON array: data after the closing bracket"
+                    return
+                continue
+
+            if byte == b'"':
+                in_string = True
+            elif byte in (b"[", b"{"):
+                depth += 1
+            elif byte in (b"]", b"}"):
+                if depth == 0:
+                    yield index, "Malformed JSON array: unbalanced brackets"
+                    return
+                depth -= 1
+            element += chunk[position : start + 1]
+            position = start + 1
+
+    yield index, "Malformed JSON array: body ended before the closing bracket"
+
+
+async def _iter_ndjson_items(request: Request) -> AsyncIterator[BatchItem]:
+    """Validate NDJSON lines as they arrive; input is never buffered beyond one line."""
+
+    index = 0
+    remainder = b""
+    async for chunk in request.stream():
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield _validate_batch_item(index, line)
+                index += 1
+    if remainder.strip():
+        yield _validate_batch_item(index, remainder)
+
+
+def _error_entry(index: int, errors: Any) -> tuple[str, bytes, bool]:
+    return f"{index:05d}.error.json", json.dumps({"index": index, "errors": errors}).encode("utf-8"), True
+
+
+async def _render_batch_item(index: int, item: QRRequestBody) -> tuple[str, bytes, bool]:
+    """Render one batch item into a (filename, payload, compress) ZIP entry; failures become error entries."""
+
+    format = item.format or QRFormat.PNG
+    try:
+        background_color, fill_color = _resolve_colors(item.background_color, item.fill_color)
+        render_key = _render_key(item.url, background_color, fill_color, item.size, format)
+
+        # Batches share the executor with interactive requests, so back off instead of failing
+        for attempt in range(_BATCH_RETRY_ATTEMPTS):
+            try:
+                payload, _ = await _render_cached(render_key, item.url, background_color, fill_color, item.size, format)
+                break
+            except ExecutorQueueFullError:
+                await asyncio.sleep(_BATCH_RETRY_DELAY * (attempt + 1))
+        else:
+            return _error_entry(index, "QR renderer is busy")
+    except HTTPException as ex:
+        return _error_entry(index, ex.detail)
+    except Exception as ex:
+        _logger.exception("Batch item %s failed: %s", index, ex)
+        return _error_entry(index, "Render failed")
+
+    # Raster formats are already compressed; only SVG benefits from deflate
+    return f"{index:05d}.{format}", payload, format == QRFormat.SVG
+
+
+async def _stream_batch_zip(items: AsyncIterator[BatchItem]) -> AsyncIterator[bytes]:
+    """Render items with bounded concurrency and emit ZIP bytes as each entry completes."""
+
+    archive = ZipStreamWriter()
+    pending: set[asyncio.Task] = set()
+    count = 0
+
+    async def drain(return_when: str) -> AsyncIterator[bytes]:
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        for task in done:
+            yield archive.add(*task.result())
+
+    try:
+        async for index, item in items:
+            if index >= settings.qr_batch_max_items:
+                detail = f"Batch exceeds {settings.qr_batch_max_items} items; remaining items skipped"
+                yield archive.add(*_error_entry(index, detail))
+                break
+            count += 1
+
+            if isinstance(item, QRRequestBody):
+                pending.add(asyncio.create_task(_render_batch_item(index, item)))
+            else:
+                yield archive.add(*_error_entry(index, item))
+
+            if len(pending) >= settings.qr_batch_concurrency:
+                async for chunk in drain(asyncio.FIRST_COMPLETED):
+                    yield chunk
+
+        if pending:
+            async for chunk in drain(asyncio.ALL_COMPLETED):
+                yield chunk
+
+        yield archive.close()
+        _logger.verbose("Streamed QR batch of %s items", count)
+    finally:
+        # Client went away mid-stream; do not leave renders running
+        for task in pending:
+            task.cancel()
+
+
+@router.post(
+    path="/batch",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Generate QR codes in bulk",
+    description="Accepts a JSON array or NDJSON stream of QR requests and streams back a ZIP archive. "
+    "Items that fail produce an `<index>.error.json` entry instead of aborting the batch.",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/QRRequestBody"}}},
+                "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/QRRequestBody"}},
+            },
+        }
+    },
+    responses={
+        200: {"content": {"application/zip": {}}, "description": "ZIP archive of QR codes"},
+        400: {"description": "Empty body"},
+        422: {"description": "Body is not a JSON array"},
+    },
+)
+async def post_qr_batch(request: Request) -> StreamingResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in _NDJSON_MEDIA_TYPES:
+        items = _iter_ndjson_items(request)
+    else:
+        # Elements are split off as they arrive, so only the opening bracket is checked before streaming;
+        # later syntax errors and items past QR_BATCH_MAX_ITEMS become error entries, as with NDJSON
+        chunks = request.stream().__aiter__()
+        first = b""
+        async for chunk in chunks:
+            first = chunk.lstrip()
+            if first:
+                break
+        if not first:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty body")
+        if not first.startswith(b"["):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Expected a JSON array")
+        items = _iter_json_array_items(first, chunks)
+
+    return _BodyStreamingResponse(
+        _stream_batch_zip(items),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="qr-codes.zip"'},
     )
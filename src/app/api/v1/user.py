@@ -1,83 +1,220 @@
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, status
-from uuid import UUID, uuid7
+from typing import Optional
+from uuid import UUID
 
-from src.app.core.logger import get_logger, LoggingRoute
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import IntegrityError
 
-from ...schemas.user import User, UserUpdate
+from src.app.core.config import settings
+from src.app.core.db import async_engine
+from src.app.core.logger import get_logger
+from src.app.core.singleflight import SingleFlightRoute
+
+from ..dependencies import get_user_reader_repository, get_user_writer_repository
+from ...repositories import decode_cursor, encode_cursor, InvalidCursorError, parse_user_etags, user_etag, UserRepository
+from ...schemas.user import User, UserImportSummary, UserPage, UserUpdate
+from ...services.render_cache import etag_matches
+from ...services.user_cache import user_cache
+from ...services.user_import import ImportFormat, import_users
 
 _logger = get_logger(__name__)
 
-router = APIRouter(prefix="/user", tags=["User"], route_class=LoggingRoute)
+router = APIRouter(prefix="/user", tags=["User"], route_class=SingleFlightRoute)
+
+_PAGE_SIZE_DEFAULT = 50
+_PAGE_SIZE_MAX = 500
+
+_IMPORT_MEDIA_TYPES: dict[str, ImportFormat] = {
+    "application/x-ndjson": ImportFormat.NDJSON,
+    "application/jsonl": ImportFormat.NDJSON,
+    "text/csv": ImportFormat.CSV,
+}
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+
+def _precondition_failed() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User was modified or does not exist")
+
 
+# Versions an If-Match header allows a write against; None when the write is unconditional
+def _if_match_versions(id: UUID, if_match: Optional[str]) -> Optional[list[datetime]]:
+    """
+    ETags here are weak (they name a version, not bytes), so If-Match uses weak comparison.
+    "*" only requires the user to exist, which the write itself checks.
+    """
 
-_user = User(
-    id=uuid7(),
-    email="brendan@venibren.dev",
-    email_verified=True,
-    username="venibren",
-    nickname="Brendan",
-    discriminator="0000",
-    created_date=datetime.now(),
-    updated_date=datetime.now(),
-    is_active=True,
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = parse_user_etags(if_match, id)
+    if not versions:
+        raise _precondition_failed()
+    return versions
+
+
+@router.get(
+    path="",
+    response_model=UserPage,
+    status_code=status.HTTP_200_OK,
+    responses={400: {"description": "Invalid cursor"}},
 )
+async def list_users(
+    limit: int = Query(default=_PAGE_SIZE_DEFAULT, ge=1, le=_PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(default=None, description="`nextCursor` from the previous page"),
+    users: UserRepository = Depends(get_user_reader_repository),
+) -> UserPage:
+    _logger.debug("List users (limit %s, cursor %s)", limit, cursor)
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as ex:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ex))
+
+    rows, has_more = await users.list_page(limit, after)
+
+    return UserPage(
+        items=rows,
+        next_cursor=encode_cursor(rows[-1]["id"]) if has_more else None,
+        has_more=has_more,
+    )
+
+
+@router.post(
+    path="/bulk",
+    response_model=UserImportSummary,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Unreadable CSV header"},
+        415: {"description": "Body is neither NDJSON nor CSV"},
+    },
+)
+async def import_users_bulk(
+    request: Request,
+    tenant_id: Optional[UUID] = Query(default=None, description="Tenant for rows that do not name one"),
+) -> UserImportSummary:
+    """Stream NDJSON or CSV users into the table; invalid rows are reported, not fatal."""
+
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    format = _IMPORT_MEDIA_TYPES.get(media_type)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Supported media types: {', '.join(_IMPORT_MEDIA_TYPES)}",
+        )
+
+    _logger.info("Bulk user import (%s, tenant %s)", format, tenant_id)
+    try:
+        result = await import_users(async_engine, request.stream(), format, tenant_id)
+    except ValueError as ex:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ex))
+
+    return UserImportSummary.model_validate(result, from_attributes=True)
 
 
 @router.get(
     path="/{id}",
     response_model=User,
     status_code=status.HTTP_200_OK,
+    responses={304: {"description": "Not Modified"}, 404: {"description": "User not found"}},
 )
-async def get_user(id: UUID) -> User:
+async def get_user(
+    id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    users: UserRepository = Depends(get_user_reader_repository),
+    primary: UserRepository = Depends(get_user_writer_repository),
+) -> User | Response:
     _logger.debug("Get user by id: %s", id)
 
-    # if id != _user.id:
-    #     raise HTTPException(
-    #         status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-    #     )
-
-    return _user
+    if settings.user_cache_enabled:
+        # Fills come from the primary: a lagging replica could re-cache the row a write just invalidated.
+        # The session only connects on a miss.
+        user = await user_cache.get_by_id(id, lambda: primary.get(id))
+        if user is None:
+            raise _not_found()
+        etag = user_etag(user.id, user.updated_at)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    else:
+        # A revalidation that still matches costs one index-only probe and no serialization
+        if if_none_match:
+            version = await users.get_version(id)
+            if version is None:
+                raise _not_found()
+            etag = user_etag(id, version)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        row = await users.get(id)
+        if row is None:
+            raise _not_found()
+        user = User.model_validate(row)
+        etag = user_etag(user.id, user.updated_at)
+
+    response.headers["ETag"] = etag
+    return user
 
 
 @router.patch(
     path="/{id}",
     response_model=User,
     status_code=status.HTTP_200_OK,
+    responses={
+        404: {"description": "User not found"},
+        409: {"description": "Email already in use"},
+        412: {"description": "If-Match does not name the current version"},
+    },
 )
-async def update_user(id: UUID, payload: UserUpdate) -> User:
-    _logger.debug("Update user id: %s with payload: %s", id, payload.model_dump())
-
-    if id != _user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-
-    updated_fields = payload.model_dump(exclude_unset=True)
-
-    for field, value in updated_fields.items():
-        setattr(_user, field, value)
-
-    _user.updated_date = datetime.now()
-
-    return _user
+async def update_user(
+    id: UUID,
+    payload: UserUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    users: UserRepository = Depends(get_user_writer_repository),
+) -> User:
+    changes = payload.model_dump(exclude_unset=True)
+    _logger.debug("Update user id: %s with fields: %s", id, sorted(changes))
+
+    # Checked by the UPDATE itself, so a concurrent edit cannot slip in between a read and the write
+    versions = _if_match_versions(id, if_match)
+    try:
+        row = await users.patch(id, changes, versions)
+        await users.session.commit()
+    except IntegrityError:
+        await users.session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already in use")
+
+    if row is None:
+        raise _precondition_failed() if if_match is not None else _not_found()
+
+    # Committed; drop cached copies (and any cached miss for the new email) before answering
+    await user_cache.invalidate(id, row["email"])
+
+    response.headers["ETag"] = user_etag(row["id"], row["updated_at"])
+    return User.model_validate(row)
 
 
 @router.delete(
     path="/{id}",
     response_model=User,
     status_code=status.HTTP_200_OK,
+    responses={404: {"description": "User not found"}, 412: {"description": "If-Match does not name the current version"}},
 )
-async def delete_user(id: UUID) -> User:
+async def delete_user(
+    id: UUID,
+    if_match: Optional[str] = Header(default=None),
+    users: UserRepository = Depends(get_user_writer_repository),
+) -> User:
     _logger.debug("Delete user id: %s", id)
 
-    if id != _user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
+    row = await users.soft_delete(id, _if_match_versions(id, if_match))
+    await users.session.commit()
+
+    if row is None:
+        raise _precondition_failed() if if_match is not None else _not_found()
 
-    _user.email = f"deleted_{_user.email}"
-    _user.is_active = False
-    _user.updated_date = datetime.now()
+    await user_cache.invalidate(id, row["email"])
 
-    return _user
+    return User.model_validate(row)
@@ -0,0 +1,65 @@
+"""
+Bulk-load users from an NDJSON or CSV file (or stdin) with the same pipeline as POST /v1/user/bulk.
+
+    python -m src.app.cli.import_users users.ndjson
+    python -m src.app.cli.import_users --format csv --tenant-id <uuid> - < users.csv
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from pathlib import Path
+from typing import BinaryIO
+from uuid import UUID
+
+from src.app.core.db import async_engine, dispose_engine
+from src.app.core.logger import setup_logger, start_log_listener, stop_log_listener
+from src.app.services.user_import import ImportFormat, import_users
+
+_READ_SIZE = 64 * 1024
+
+
+async def _read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    # Blocking reads go to a thread so a slow pipe does not stall the loop
+    while chunk := await asyncio.to_thread(stream.read, _READ_SIZE):
+        yield chunk
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk import users from NDJSON or CSV")
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", type=ImportFormat, choices=list(ImportFormat), help="Defaults to the file extension (.csv or NDJSON)")
+    parser.add_argument("--tenant-id", type=UUID, help="Tenant for rows that do not name one")
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> int:
+    format = args.format or (ImportFormat.CSV if Path(args.path).suffix.lower() == ".csv" else ImportFormat.NDJSON)
+
+    try:
+        if args.path == "-":
+            result = await import_users(async_engine, _read_chunks(sys.stdin.buffer), format, args.tenant_id)
+        else:
+            with open(args.path, "rb") as stream:
+                result = await import_users(async_engine, _read_chunks(stream), format, args.tenant_id)
+    finally:
+        await dispose_engine()
+
+    print(json.dumps(asdict(result), indent=2, default=str))
+    return 1 if result.failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    setup_logger()
+    start_log_listener()
+    try:
+        return asyncio.run(_run(_parse_args(argv)))
+    finally:
+        stop_log_listener()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+from .backends import CacheBackend, MemoryBackend
+from .cache import build_backend, Cache, cache_backend, close_cache, get_cache, start_cache
+from .decorators import cached
+from .resp import RespBackend, RespError
+from .server import LocalCacheServer
+
+__all__ = [
+    "build_backend",
+    "Cache",
+    "cache_backend",
+    "CacheBackend",
+    "cached",
+    "close_cache",
+    "get_cache",
+    "LocalCacheServer",
+    "MemoryBackend",
+    "RespBackend",
+    "RespError",
+    "start_cache",
+]
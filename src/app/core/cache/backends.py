@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Optional, Protocol
+
+
+class CacheBackend(Protocol):
+    """
+    Byte store behind a Cache. Values are opaque; `ttl` is the hard expiry in seconds (None keeps the
+    entry until evicted). Implementations may raise on I/O errors; Cache treats failures as misses.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]: ...
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None: ...
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def connect(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """Per-worker LRU with per-entry expiry; nothing is shared between workers."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Optional[float], bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    async def connect(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+__all__ = ["CacheBackend", "MemoryBackend"]
@@ -0,0 +1,364 @@
+import asyncio
+import json
+import random
+import secrets
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from pydantic import TypeAdapter
+
+from src.app.core.config import CacheBackendKind, settings
+from src.app.core.logger import get_logger
+from src.app.core.metrics import metrics
+from src.app.core.singleflight import SingleFlight
+from .backends import CacheBackend, MemoryBackend
+from .resp import RespBackend
+
+_logger = get_logger(__name__)
+
+_ANY: TypeAdapter[Any] = TypeAdapter(Any)
+_HEADER_END = b"\n"
+
+cache_requests = metrics.counter(
+    "cache_requests_total",
+    "Cache reads by namespace and outcome (hit, stale, miss, error)",
+    ("namespace", "outcome"),
+)
+cache_operation_duration = metrics.histogram(
+    "cache_operation_seconds",
+    "Cache backend round trips and loader runs by namespace",
+    ("namespace", "operation"),
+)
+
+
+def _hit_ratios() -> dict[tuple[str, ...], float]:
+    totals: dict[str, float] = {}
+    hits: dict[str, float] = {}
+    for (namespace, outcome), count in cache_requests.values.items():
+        totals[namespace] = totals.get(namespace, 0) + count
+        if outcome in ("hit", "stale"):
+            hits[namespace] = hits.get(namespace, 0) + count
+    return {(namespace,): hits.get(namespace, 0) / total for namespace, total in totals.items() if total}
+
+
+metrics.callback("cache_hit_ratio", "Share of reads answered from the cache since the worker started", _hit_ratios, ("namespace",))
+
+
+###########################################
+# Entry envelope
+###########################################
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    # Wall-clock time after which the entry is stale; shared between workers, so not monotonic
+    fresh_until: float
+    tags: dict[str, str]
+    payload: bytes
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+
+def _pack(fresh_until: float, tags: Mapping[str, str], payload: bytes) -> bytes:
+    header = json.dumps([fresh_until, tags], separators=(",", ":")).encode("utf-8")
+    return header + _HEADER_END + payload
+
+
+def _unpack(raw: bytes) -> Optional[_Entry]:
+    header, separator, payload = raw.partition(_HEADER_END)
+    if not separator:
+        return None
+    try:
+        fresh_until, tags = json.loads(header)
+    except ValueError:
+        return None
+    return _Entry(fresh_until, tags, payload)
+
+
+###########################################
+# Cache
+###########################################
+class Cache:
+    """
+    Namespaced async cache over a CacheBackend; values are serialized as JSON through a TypeAdapter.
+
+    Each entry is fresh for its TTL minus up to `jitter` of it, then stale for `stale_ttl` more seconds:
+    get() treats stale entries as misses, while get_or_set() serves them and refreshes in the background.
+    Tags are versioned keys shared by all namespaces; invalidating a tag retires every entry written under it.
+    Backend errors are logged, counted as errors and treated as misses so the cache never takes a request down.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        *,
+        key_prefix: str = "",
+        default_ttl: float = 60.0,
+        jitter: float = 0.0,
+        stale_ttl: float = 0.0,
+    ) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self.jitter = jitter
+        self.stale_ttl = stale_ttl
+
+        self._prefix = f"{key_prefix}:" if key_prefix else ""
+        self._flight: SingleFlight[Any] = SingleFlight()
+        self._refreshing: set[str] = set()
+        self._background: set[asyncio.Task] = set()
+
+    def key(self, key: str) -> str:
+        return f"{self._prefix}{self.namespace}:{key}"
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self._prefix}tag:{tag}"
+
+    async def get(self, key: str, default: Any = None, *, adapter: TypeAdapter = _ANY) -> Any:
+        entries = await self._read([self.key(key)])
+        if entries is None:
+            return default
+
+        entry = entries[0]
+        if entry is None or not entry.fresh:
+            self._count("miss")
+            return default
+        self._count("hit")
+        return adapter.validate_json(entry.payload)
+
+    async def get_many(self, keys: Sequence[str], *, adapter: TypeAdapter = _ANY) -> dict[str, Any]:
+        """Fresh values by key; missing and stale keys are left out."""
+
+        entries = await self._read([self.key(key) for key in keys])
+        if entries is None:
+            return {}
+
+        found: dict[str, Any] = {}
+        for key, entry in zip(keys, entries):
+            if entry is None or not entry.fresh:
+                self._count("miss")
+                continue
+            self._count("hit")
+            found[key] = adapter.validate_json(entry.payload)
+        return found
+
+    async def set(self, key: str, value: Any, *, ttl: Optional[float] = None, tags: Iterable[str] = (), adapter: TypeAdapter = _ANY) -> None:
+        await self.set_many({key: value}, ttl=ttl, tags=tags, adapter=adapter)
+
+    async def set_many(
+        self,
+        items: Mapping[str, Any],
+        *,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        adapter: TypeAdapter = _ANY,
+    ) -> None:
+        versions = await self._tag_versions(tags)
+        if versions is None:
+            return
+        await self._write({self.key(key): adapter.dump_json(value) for key, value in items.items()}, ttl, versions)
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            with self._timed("delete"):
+                await self.backend.delete(*(self.key(key) for key in keys))
+        except Exception as ex:
+            _logger.warning("Cache delete failed in %s: %s", self.namespace, ex)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Retire every entry written under any of the tags, in every namespace."""
+
+        try:
+            with self._timed("invalidate"):
+                await self.backend.set_many({self.tag_key(tag): secrets.token_hex(8).encode("ascii") for tag in tags})
+        except Exception as ex:
+            _logger.warning("Cache tag invalidation failed for %s: %s", tags, ex)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        *,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        adapter: TypeAdapter = _ANY,
+        stale_while_revalidate: bool = True,
+    ) -> Any:
+        """
+        Read-through lookup. Concurrent misses for a key share one loader call;
+        a stale entry is returned immediately while a single background refresh replaces it.
+        The refresh runs after the caller has moved on, so a loader that closes over request-scoped
+        objects (sessions, requests) must pass stale_while_revalidate=False; stale entries are then misses.
+        """
+
+        full_key = self.key(key)
+        tags = tuple(tags)
+        entries = await self._read([full_key])
+        entry = entries[0] if entries else None
+
+        if entry is not None and (entry.fresh or stale_while_revalidate):
+            if entry.fresh:
+                self._count("hit")
+            else:
+                self._count("stale")
+                self._refresh(full_key, loader, ttl, tags, adapter)
+            return adapter.validate_json(entry.payload)
+
+        if entries is not None:
+            self._count("miss")
+        result, _ = await self._flight.do(full_key, lambda: self._load(full_key, loader, ttl, tags, adapter))
+        return result
+
+    async def close(self) -> None:
+        """Wait for background refreshes to finish."""
+
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    def _refresh(self, full_key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float], tags: tuple[str, ...], adapter: TypeAdapter) -> None:
+        if full_key in self._refreshing:
+            return
+        self._refreshing.add(full_key)
+
+        task = asyncio.ensure_future(self._flight.do(full_key, lambda: self._load(full_key, loader, ttl, tags, adapter)))
+        self._background.add(task)
+
+        def _done(task: asyncio.Task) -> None:
+            self._background.discard(task)
+            self._refreshing.discard(full_key)
+            if not task.cancelled() and task.exception() is not None:
+                _logger.warning("Background cache refresh of %s failed: %s", full_key, task.exception())
+
+        task.add_done_callback(_done)
+
+    async def _load(self, full_key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float], tags: tuple[str, ...], adapter: TypeAdapter) -> Any:
+        # Versions are read before loading, so an invalidation during the load retires the result
+        versions = await self._tag_versions(tags)
+
+        with self._timed("load"):
+            value = await loader()
+
+        if versions is not None:
+            await self._write({full_key: adapter.dump_json(value)}, ttl, versions)
+        return value
+
+    async def _read(self, full_keys: Sequence[str]) -> Optional[list[Optional[_Entry]]]:
+        """Valid entries (fresh or stale) per key; None when the backend failed, counted as errors."""
+
+        try:
+            with self._timed("get"):
+                raw_values = await self.backend.get_many(full_keys)
+                entries = [None if raw is None else _unpack(raw) for raw in raw_values]
+
+                tags = sorted({tag for entry in entries if entry is not None for tag in entry.tags})
+                if tags:
+                    current = dict(zip(tags, await self.backend.get_many([self.tag_key(tag) for tag in tags])))
+        except Exception as ex:
+            _logger.warning("Cache read failed in %s: %s", self.namespace, ex)
+            self._count("error", len(full_keys))
+            return None
+
+        if not tags:
+            return entries
+
+        # A tag that was invalidated or evicted no longer matches the version the entry was written with
+        return [
+            entry if entry is not None and all(current[tag] is not None and current[tag].decode("ascii") == version for tag, version in entry.tags.items()) else None
+            for entry in entries
+        ]
+
+    async def _tag_versions(self, tags: Iterable[str]) -> Optional[dict[str, str]]:
+        """Current version per tag, creating missing ones; None when the backend is unavailable."""
+
+        tags = sorted(set(tags))
+        if not tags:
+            return {}
+
+        try:
+            with self._timed("tags"):
+                values = await self.backend.get_many([self.tag_key(tag) for tag in tags])
+                versions = {tag: value.decode("ascii") for tag, value in zip(tags, values) if value is not None}
+
+                missing = {tag: secrets.token_hex(8) for tag in tags if tag not in versions}
+                if missing:
+                    await self.backend.set_many({self.tag_key(tag): version.encode("ascii") for tag, version in missing.items()})
+                    versions.update(missing)
+        except Exception as ex:
+            _logger.warning("Cache tag lookup failed in %s: %s", self.namespace, ex)
+            return None
+
+        return versions
+
+    async def _write(self, payloads: Mapping[str, bytes], ttl: Optional[float], versions: Mapping[str, str]) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        fresh_for = ttl * (1 - random.uniform(0, self.jitter))
+        fresh_until = time.time() + fresh_for
+
+        try:
+            with self._timed("set"):
+                await self.backend.set_many({key: _pack(fresh_until, versions, payload) for key, payload in payloads.items()}, fresh_for + self.stale_ttl)
+        except Exception as ex:
+            _logger.warning("Cache write failed in %s: %s", self.namespace, ex)
+
+    def _count(self, outcome: str, amount: int = 1) -> None:
+        cache_requests.inc((self.namespace, outcome), amount)
+
+    @contextmanager
+    def _timed(self, operation: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cache_operation_duration.observe((self.namespace, operation), time.perf_counter() - start)
+
+
+###########################################
+# Application cache
+###########################################
+def build_backend() -> CacheBackend:
+    if settings.cache_backend == CacheBackendKind.REDIS:
+        return RespBackend(settings.cache_url, pool_size=settings.cache_pool_size, timeout=settings.cache_timeout)
+    return MemoryBackend(settings.cache_max_entries)
+
+
+cache_backend: CacheBackend = build_backend()
+
+_caches: dict[str, Cache] = {}
+
+
+# Cache for a namespace on the application backend, configured from CacheSettings
+def get_cache(namespace: str) -> Cache:
+    cache = _caches.get(namespace)
+    if cache is None:
+        cache = _caches[namespace] = Cache(
+            cache_backend,
+            namespace,
+            key_prefix=settings.cache_key_prefix,
+            default_ttl=settings.cache_default_ttl,
+            jitter=settings.cache_ttl_jitter,
+            stale_ttl=settings.cache_stale_ttl,
+        )
+    return cache
+
+
+async def start_cache() -> None:
+    try:
+        await cache_backend.connect()
+    except Exception as ex:
+        # Caching is an optimization; serve uncached until the backend comes back
+        _logger.warning("Cache backend %s is unavailable, continuing without it: %s", settings.cache_backend, ex)
+    else:
+        _logger.info("Cache backend ready: %s", settings.cache_backend)
+
+
+async def close_cache() -> None:
+    for cache in _caches.values():
+        await cache.close()
+    await cache_backend.close()
+
+
+__all__ = ["build_backend", "Cache", "cache_backend", "close_cache", "get_cache", "start_cache"]
@@ -0,0 +1,105 @@
+import functools
+import hashlib
+import inspect
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, get_type_hints, Optional, Union
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+from .cache import Cache, get_cache
+
+_KEY_TYPES = (str, int, float, bool, UUID, Decimal, date, datetime, time, Enum)
+# Longer argument lists are hashed so keys stay short
+_MAX_KEY_LENGTH = 200
+
+
+def _key_part(name: str, value: Any) -> str:
+    if value is None or isinstance(value, _KEY_TYPES):
+        return repr(value)
+    if isinstance(value, (tuple, list, frozenset, set)):
+        parts = [_key_part(name, item) for item in value]
+        return "(" + ",".join(sorted(parts) if isinstance(value, (set, frozenset)) else parts) + ")"
+    raise TypeError(f"Argument {name!r} of type {type(value).__name__} cannot be part of a cache key; pass key= or ignore=")
+
+
+def cached(
+    namespace: str,
+    *,
+    ttl: Optional[float] = None,
+    tags: Union[Iterable[str], Callable[..., Iterable[str]]] = (),
+    key: Optional[Callable[..., str]] = None,
+    ignore: Iterable[str] = (),
+    cache: Optional[Cache] = None,
+    stale_while_revalidate: Optional[bool] = None,
+):
+    """
+    Read-through caching for an async function, keyed by its arguments.
+
+    Arguments must be plain values (str, numbers, UUIDs, enums, dates and sequences of them); list
+    per-request objects such as sessions or requests in `ignore`, or build the key yourself with `key`.
+    `tags` may be a callable taking the same arguments. The return annotation drives (de)serialization,
+    so a cached `-> User` comes back as a User. The signature is preserved, so FastAPI dependencies work.
+
+    Stale entries are normally served while the call is re-run in the background after the request has
+    finished, which must not reuse per-request objects. It is therefore off when `ignore` is given (and
+    enabling it then is refused); with `key`, pass stale_while_revalidate=False if arguments hold such objects.
+
+    The wrapper exposes `cache_key(*args, **kwargs)` and `invalidate(*args, **kwargs)`.
+    """
+
+    ignored = frozenset(ignore)
+    if stale_while_revalidate is None:
+        stale_while_revalidate = not ignored
+    elif stale_while_revalidate and ignored:
+        raise ValueError("stale_while_revalidate would refresh with the request-scoped arguments listed in ignore")
+
+    def decorator(fn):
+        if not inspect.iscoroutinefunction(fn):
+            raise TypeError(f"@cached needs an async function, got {fn.__qualname__}")
+
+        signature = inspect.signature(fn)
+        return_type = get_type_hints(fn).get("return", Any)
+        adapter: TypeAdapter = TypeAdapter(return_type)
+        prefix = f"{fn.__module__}.{fn.__qualname__}"
+
+        def cache_key(*args, **kwargs) -> str:
+            if key is not None:
+                suffix = key(*args, **kwargs)
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                suffix = ",".join(f"{name}={_key_part(name, value)}" for name, value in bound.arguments.items() if name not in ignored)
+            if len(suffix) > _MAX_KEY_LENGTH:
+                suffix = hashlib.blake2b(suffix.encode("utf-8"), digest_size=16).hexdigest()
+            return f"{prefix}:{suffix}"
+
+        def target() -> Cache:
+            return cache if cache is not None else get_cache(namespace)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+            return await target().get_or_set(
+                cache_key(*args, **kwargs),
+                lambda: fn(*args, **kwargs),
+                ttl=ttl,
+                tags=entry_tags,
+                adapter=adapter,
+                stale_while_revalidate=stale_while_revalidate,
+            )
+
+        async def invalidate(*args, **kwargs) -> None:
+            await target().delete(cache_key(*args, **kwargs))
+
+        wrapper.cache_key = cache_key
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
+
+
+__all__ = ["cached"]
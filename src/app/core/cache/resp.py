@@ -0,0 +1,212 @@
+import asyncio
+from collections.abc import Mapping, Sequence
+from typing import Any, Optional, Union
+from urllib.parse import unquote, urlsplit
+
+from src.app.core.logger import get_logger
+
+_logger = get_logger(__name__)
+
+_CRLF = b"\r\n"
+
+Arg = Union[bytes, str, int, float]
+
+
+class RespError(Exception):
+    """Error reply from the server (a `-ERR ...` line)."""
+
+
+class RespProtocolError(ConnectionError):
+    """The stream is not valid RESP; the connection cannot be reused."""
+
+
+###########################################
+# Wire format
+###########################################
+def _to_bytes(value: Arg) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+# Encode a command as a RESP array of bulk strings
+def encode_command(*args: Arg) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = _to_bytes(arg)
+        parts.append(b"$%d\r\n" % len(data))
+        parts.append(data)
+        parts.append(_CRLF)
+    return b"".join(parts)
+
+
+# Encode a reply; errors are passed as RespError instances
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-" + str(value).encode("utf-8") + _CRLF
+    if isinstance(value, bool) or isinstance(value, int):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, str):
+        return b"+" + value.encode("utf-8") + _CRLF
+    if isinstance(value, bytes):
+        return b"$%d\r\n" % len(value) + value + _CRLF
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    raise TypeError(f"Cannot encode {type(value).__name__} as RESP")
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP2 value. Error replies are returned as RespError instances, not raised."""
+
+    line = await reader.readline()
+    if not line.endswith(_CRLF):
+        raise RespProtocolError("Connection closed mid-reply")
+
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        return RespError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespProtocolError(f"Unexpected reply type {kind!r}")
+
+
+###########################################
+# Client backend
+###########################################
+class _Connection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def execute_many(self, commands: Sequence[Sequence[Arg]]) -> list[Any]:
+        # Pipelined: every command is written before the first reply is read
+        self.writer.write(b"".join(encode_command(*command) for command in commands))
+        await self.writer.drain()
+        return [await read_reply(self.reader) for _ in commands]
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RespBackend:
+    """
+    CacheBackend for Redis-compatible servers (`redis://[:password@]host[:port][/db]`).
+    Keeps up to `pool_size` connections; a connection that times out or sees an I/O error is dropped
+    rather than reused, since its reply stream can no longer be trusted.
+    """
+
+    def __init__(self, url: str, pool_size: int = 8, timeout: float = 0.25) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("redis", "resp"):
+            raise ValueError(f"Unsupported cache URL scheme: {parts.scheme!r}")
+
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.username = unquote(parts.username) if parts.username else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: list[_Connection] = []
+
+    async def execute(self, *args: Arg) -> Any:
+        (reply,) = await self.execute_many([args])
+        return reply
+
+    async def execute_many(self, commands: Sequence[Sequence[Arg]]) -> list[Any]:
+        """Run commands on one connection; raises RespError for the first error reply."""
+
+        async with asyncio.timeout(self.timeout), self._slots:
+            connection = self._idle.pop() if self._idle else await self._open()
+            try:
+                replies = await connection.execute_many(commands)
+            except BaseException:
+                connection.close()
+                raise
+            self._idle.append(connection)
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self.execute("MGET", *keys)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.execute(*self._set_command(key, value, ttl))
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        # MSET cannot carry an expiry, so pipeline individual SETs instead
+        if items:
+            await self.execute_many([self._set_command(key, value, ttl) for key, value in items.items()])
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.execute("DEL", *keys)
+
+    async def connect(self) -> None:
+        """Open one connection up front so a misconfigured server shows up at startup."""
+
+        await self.execute("PING")
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    @staticmethod
+    def _set_command(key: str, value: bytes, ttl: Optional[float]) -> tuple[Arg, ...]:
+        if ttl is None:
+            return ("SET", key, value)
+        return ("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    async def _open(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = _Connection(reader, writer)
+
+        setup: list[tuple[Arg, ...]] = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+
+        if setup:
+            try:
+                replies = await connection.execute_many(setup)
+            except BaseException:
+                connection.close()
+                raise
+            for reply in replies:
+                if isinstance(reply, RespError):
+                    connection.close()
+                    raise reply
+
+        _logger.debug("Opened cache connection to %s:%s", self.host, self.port)
+        return connection
+
+
+__all__ = ["encode_command", "encode_reply", "read_reply", "RespBackend", "RespError", "RespProtocolError"]
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any, Optional
+
+from src.app.core.logger import get_logger
+from .backends import MemoryBackend
+from .resp import encode_reply, read_reply, RespError, RespProtocolError
+
+_logger = get_logger(__name__)
+
+
+class LocalCacheServer:
+    """
+    Stand-in for a Redis server speaking the subset of RESP that RespBackend uses
+    (PING, AUTH, SELECT, GET, MGET, SET with EX/PX, DEL, FLUSHDB), backed by a MemoryBackend.
+    For tests and local development; every database number shares one keyspace.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, max_entries: int = 10_000) -> None:
+        self.host = host
+        self.port = port
+        self.store = MemoryBackend(max_entries)
+        self.commands = 0
+
+        self._server: Optional[asyncio.Server] = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        # Port 0 asks the OS for a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        _logger.debug("Local cache server listening on %s:%s", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    command = await read_reply(reader)
+                except (RespProtocolError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                if not isinstance(command, list) or not command:
+                    writer.write(encode_reply(RespError("ERR expected a command array")))
+                else:
+                    self.commands += 1
+                    writer.write(encode_reply(await self._dispatch(command)))
+                await writer.drain()
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, command: list[bytes]) -> Any:
+        name = command[0].decode("utf-8").upper()
+        args = command[1:]
+
+        if name == "PING":
+            return "PONG"
+        if name in ("AUTH", "SELECT"):
+            return "OK"
+        if name == "FLUSHDB":
+            await self.store.clear()
+            return "OK"
+        if name in ("GET", "MGET", "DEL") and args:
+            keys = [key.decode("utf-8") for key in args]
+            values = await self.store.get_many(keys)
+            if name == "GET" and len(keys) == 1:
+                return values[0]
+            if name == "MGET":
+                return values
+            if name == "DEL":
+                await self.store.delete(*keys)
+                return sum(1 for value in values if value is not None)
+        if name == "SET" and len(args) in (2, 4):
+            ttl = None
+            if len(args) == 4:
+                unit, amount = args[2].decode("utf-8").upper(), int(args[3])
+                if unit not in ("EX", "PX") or amount <= 0:
+                    return RespError("ERR syntax error")
+                ttl = amount if unit == "EX" else amount / 1000
+            await self.store.set(args[0].decode("utf-8"), args[1], ttl)
+            return "OK"
+
+        return RespError(f"ERR unknown command or wrong number of arguments for '{name.lower()}'")
+
+
+__all__ = ["LocalCacheServer"]
@@ -22,6 +22,87 @@ class Environment(StrEnum):
         return None
 
 
+###################################################################
+### Executor Modes
+###################################################################
+class ExecutorMode(StrEnum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    @classmethod
+    def _missing_(cls, value):
+        value = value.lower()
+        for member in cls:
+            if member == value:
+                return member
+        return None
+
+
+###################################################################
+### Replica Selection Strategies
+###################################################################
+class ReplicaSelection(StrEnum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"
+
+    @classmethod
+    def _missing_(cls, value):
+        value = value.lower()
+        for member in cls:
+            if member == value:
+                return member
+        return None
+
+
+###################################################################
+### Cache Backends
+###################################################################
+class CacheBackendKind(StrEnum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+    @classmethod
+    def _missing_(cls, value):
+        value = value.lower()
+        for member in cls:
+            if member == value:
+                return member
+        return None
+
+
+###################################################################
+### Log Formats
+###################################################################
+class LogFormat(StrEnum):
+    RICH = "rich"
+    JSON = "json"
+
+    @classmethod
+    def _missing_(cls, value):
+        value = value.lower()
+        for member in cls:
+            if member == value:
+                return member
+        return None
+
+
+###################################################################
+### Log Overflow Policies
+###################################################################
+class LogOverflowPolicy(StrEnum):
+    DROP = "drop"
+    BLOCK = "block"
+
+    @classmethod
+    def _missing_(cls, value):
+        value = value.lower()
+        for member in cls:
+            if member == value:
+                return member
+        return None
+
+
 ###################################################################
 ### Application Settings
 ###################################################################
@@ -36,6 +117,7 @@ class AppSettings(BaseSettings):
     app_port: Optional[int] = Field(default=None)
     app_workers: int = Field(default=1)
     app_root_path: str = Field(default="/api")
+    app_server_timing: bool = Field(default=True, description="Expose handler phase durations in a Server-Timing header")
 
 
 ###################################################################
@@ -45,6 +127,14 @@ class LoggerSettings(BaseSettings):
     """Logger configuration settings"""
 
     log_level: str = Field(default="DEBUG")
+    log_format: Optional[LogFormat] = Field(default=None, description="Defaults to JSON in production, Rich elsewhere")
+
+    log_request_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0, description="Fraction of requests whose HTTP lines are logged")
+    log_slow_request_ms: float = Field(default=1000.0, ge=0.0, description="Requests at least this slow are always logged")
+
+    log_async: bool = Field(default=True, description="Format and write records on a background thread")
+    log_queue_size: int = Field(default=10_000, ge=1)
+    log_queue_overflow: LogOverflowPolicy = Field(default=LogOverflowPolicy.DROP)
 
 
 ###################################################################
@@ -59,6 +149,151 @@ class CORSSettings(BaseSettings):
     cors_allow_headers: list[str] = Field(default=["*"])
 
 
+###################################################################
+### QR Code Settings
+###################################################################
+class QRSettings(BaseSettings):
+    """QR code rendering settings"""
+
+    qr_watermark_path: str = Field(default="./src/assets/qr_watermark.png")
+    qr_watermark_cache_size: int = Field(default=32, description="Resized watermarks kept per worker")
+    qr_matrix_cache_size: int = Field(default=8192, description="Encoded module matrices kept per worker")
+
+    qr_png_compress_level: int = Field(default=6, ge=0, le=9)
+    qr_png_optimize: bool = Field(default=False, description="Extra PNG size reduction at a higher CPU cost")
+    qr_webp_method: int = Field(default=4, ge=0, le=6, description="WebP effort, 0 (fast) to 6 (small)")
+
+    qr_batch_max_items: int = Field(default=10_000, ge=1)
+    qr_batch_concurrency: int = Field(default=8, ge=1, description="Batch items rendered at once per request")
+
+    qr_cache_max_entries: int = Field(default=4096)
+    qr_cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    qr_cache_control: str = Field(default="public, max-age=86400, immutable")
+    qr_response_cache_ttl: float = Field(default=300, gt=0, description="Longest time the response cache keeps a QR image, whatever its Cache-Control")
+
+
+###################################################################
+### Executor Settings
+###################################################################
+class ExecutorSettings(BaseSettings):
+    """CPU-bound rendering executor settings"""
+
+    render_executor_mode: ExecutorMode = Field(default=ExecutorMode.PROCESS)
+    render_executor_workers: Optional[int] = Field(default=None, description="Defaults to min(4, CPU count)")
+    render_executor_max_queue: int = Field(default=64, description="Pending and running jobs before rejecting with 503")
+
+
+###################################################################
+### Compression Settings
+###################################################################
+class CompressionSettings(BaseSettings):
+    """HTTP response compression settings"""
+
+    compression_enabled: bool = Field(default=True)
+    compression_minimum_size: int = Field(default=500, ge=0, description="Smaller bodies are sent as-is")
+    compression_gzip_level: int = Field(default=6, ge=1, le=9, description="Used for gzip and deflate")
+    compression_zstd_level: int = Field(default=3, ge=1, le=22, description="Only used when zstd is available")
+    compression_content_types: list[str] = Field(
+        default=["text/", "application/json", "application/x-ndjson", "application/xml", "application/javascript", "image/svg+xml"],
+        description="Media type prefixes eligible for compression",
+    )
+    compression_cache_max_entries: int = Field(default=256, ge=0, description="Precompressed bodies kept per worker, keyed by ETag")
+    compression_cache_max_bytes: int = Field(default=8 * 1024 * 1024, ge=0)
+
+
+###################################################################
+### Response Cache Settings
+###################################################################
+class ResponseCacheSettings(BaseSettings):
+    """Full HTTP response cache settings"""
+
+    response_cache_enabled: bool = Field(default=True)
+    response_cache_max_entries: int = Field(default=4096, ge=0)
+    response_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0, description="Total bytes of cached responses per worker")
+    response_cache_max_entry_bytes: int = Field(default=1024 * 1024, ge=0, description="Larger responses are passed through without being stored")
+
+
+###################################################################
+### Single-Flight Settings
+###################################################################
+class SingleFlightSettings(BaseSettings):
+    """Request coalescing settings for routes using SingleFlightRoute"""
+
+    single_flight_timeout: float = Field(default=10.0, gt=0, description="Seconds a waiter waits on a shared execution before a 504")
+    single_flight_vary_headers: list[str] = Field(
+        default=["accept", "authorization", "cookie", "if-none-match", "if-modified-since"],
+        description="Request headers that must match for requests to share a response",
+    )
+
+
+###################################################################
+### Load Shedding Settings
+###################################################################
+class AdmissionSettings(BaseSettings):
+    """Event loop monitoring and admission control settings"""
+
+    loop_monitor_interval_ms: float = Field(default=100.0, gt=0, description="Loop lag sampling interval")
+    loop_monitor_stall_ms: Optional[float] = Field(default=250.0, gt=0, description="Log the loop thread stack when blocked this long")
+
+    admission_enabled: bool = Field(default=True)
+    admission_max_loop_lag_ms: Optional[float] = Field(default=500.0, gt=0, description="Smoothed loop lag above which requests get 503")
+    admission_group_limits: dict[str, int] = Field(default={"/v1/qr-code": 256}, description="In-flight limit per path prefix before 429")
+    admission_default_limit: Optional[int] = Field(default=None, ge=1, description="In-flight limit for paths outside any group")
+    admission_exempt_paths: list[str] = Field(default=["/health", "/metrics"])
+    admission_retry_after: int = Field(default=1, ge=0, description="Retry-After seconds on rejected requests")
+
+
+###################################################################
+### Health Settings
+###################################################################
+class HealthSettings(BaseSettings):
+    """Background health probe settings"""
+
+    health_probe_interval: float = Field(default=5.0, gt=0, description="Seconds between background database probes")
+    health_probe_timeout: float = Field(default=2.0, gt=0)
+
+
+###################################################################
+### Cache Settings
+###################################################################
+class CacheSettings(BaseSettings):
+    """Application cache settings"""
+
+    cache_backend: CacheBackendKind = Field(default=CacheBackendKind.MEMORY, description="memory is per worker; redis speaks RESP to a shared server")
+    cache_url: str = Field(default="redis://localhost:6379/0")
+    cache_key_prefix: str = Field(default="py-fastapi", description="Prepended to every key so apps can share a server")
+    cache_max_entries: int = Field(default=10_000, ge=1, description="Entries kept by the memory backend")
+    cache_pool_size: int = Field(default=8, ge=1, description="Connections per worker to the cache server")
+    cache_timeout: float = Field(default=0.25, gt=0, description="Seconds before a cache operation is treated as a miss")
+
+    cache_default_ttl: float = Field(default=60.0, gt=0)
+    cache_ttl_jitter: float = Field(default=0.1, ge=0, lt=1, description="Fraction of the TTL randomly shaved off so entries do not expire together")
+    cache_stale_ttl: float = Field(default=30.0, ge=0, description="Seconds an expired entry is still served while one refresh runs; 0 disables")
+
+
+###################################################################
+### User Cache Settings
+###################################################################
+class UserCacheSettings(BaseSettings):
+    """Read-through user cache settings"""
+
+    user_cache_enabled: bool = Field(default=True)
+    user_cache_max_entries: int = Field(default=10_000, ge=1, description="Users and email pointers kept per worker")
+    user_cache_ttl: float = Field(default=300.0, gt=0, description="Seconds entries live in the shared backend")
+    user_cache_local_ttl: float = Field(default=5.0, gt=0, description="Seconds entries live per worker; bounds staleness across workers")
+    user_cache_negative_ttl: float = Field(default=2.0, gt=0, description="Seconds a lookup miss is remembered")
+
+
+###################################################################
+### User Import Settings
+###################################################################
+class UserImportSettings(BaseSettings):
+    """Bulk user import settings"""
+
+    user_import_chunk_size: int = Field(default=5000, ge=1, description="Rows validated, copied and upserted per transaction")
+    user_import_max_errors: int = Field(default=1000, ge=0, description="Row errors included in the import summary")
+
+
 ###################################################################
 ### Postgres Settings
 ###################################################################
@@ -84,6 +319,22 @@ class PostgresSettings(DatabaseSettings):
     postgres_sync_prefix: str = Field(default="postgresql://")
     postgres_async_prefix: str = Field(default="postgresql+asyncpg://")
 
+    postgres_pool_size: int = Field(default=5, ge=1, description="Persistent connections per worker")
+    postgres_max_overflow: int = Field(default=10, ge=-1, description="Extra connections under load; -1 for unlimited")
+    postgres_pool_timeout: float = Field(default=30.0, gt=0, description="Seconds to wait for a connection before failing")
+    postgres_pool_recycle: int = Field(default=1800, ge=-1, description="Reopen connections older than this many seconds; -1 disables")
+    postgres_pool_pre_ping: bool = Field(default=True)
+    postgres_pool_use_lifo: bool = Field(default=False, description="Reuse the most recent connection so idle extras can time out server-side")
+    postgres_statement_cache_size: int = Field(default=100, ge=0, description="Prepared statements cached per connection; 0 for PgBouncer transaction pooling")
+    postgres_connect_timeout: float = Field(default=10.0, gt=0)
+    postgres_command_timeout: Optional[float] = Field(default=None, gt=0, description="Per-statement timeout in seconds")
+
+    postgres_replica_urls: list[str] = Field(default=[], description="Read replica DSNs; reads fall back to the primary without any")
+    postgres_replica_selection: ReplicaSelection = Field(default=ReplicaSelection.ROUND_ROBIN)
+    postgres_replica_eject_after: int = Field(default=3, ge=1, description="Consecutive connection errors before a replica is ejected")
+    postgres_replica_eject_seconds: float = Field(default=30.0, gt=0)
+    postgres_read_your_writes: bool = Field(default=True, description="Route reads to the primary after a write in the same request")
+
     @computed_field
     @property
     def postgres_uri(self) -> str:
@@ -97,7 +348,7 @@ class PostgresSettings(DatabaseSettings):
 ###################################################################
 ### Overall Project Settings
 ###################################################################
-class Settings(AppSettings, LoggerSettings, PostgresSettings, CORSSettings):
+class Settings(AppSettings, LoggerSettings, PostgresSettings, CORSSettings, QRSettings, ExecutorSettings, CompressionSettings, ResponseCacheSettings, SingleFlightSettings, AdmissionSettings, HealthSettings, UserImportSettings, CacheSettings, UserCacheSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,11 +1,20 @@
 from .database import async_get_db, async_engine, async_session_factory, Base, dispose_engine
-from .health import check_database_health
+from .health import check_database_health, database_prober, DatabaseHealth, DatabaseHealthProber, pool_usage, PoolUsage
+from .replicas import async_get_reader_db, async_get_writer_db, replica_router
 
 __all__ = [
     "async_get_db",
+    "async_get_reader_db",
+    "async_get_writer_db",
     "async_engine",
     "async_session_factory",
     "Base",
     "check_database_health",
+    "database_prober",
+    "DatabaseHealth",
+    "DatabaseHealthProber",
     "dispose_engine",
+    "pool_usage",
+    "PoolUsage",
+    "replica_router",
 ]
@@ -1,4 +1,4 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
 
 from ..config import settings
+from .pool import instrument_engine, instrumented_pool_class
 
 
 class Base(DeclarativeBase, MappedAsDataclass):
@@ -17,7 +18,37 @@ class Base(DeclarativeBase, MappedAsDataclass):
 
 _conn_str: str = f"{settings.postgres_async_prefix}{settings.postgres_uri}"
 
-async_engine: AsyncEngine = create_async_engine(_conn_str, echo=False, future=True, pool_pre_ping=True)
+
+# Pool sizing and asyncpg connection arguments from PostgresSettings
+def _engine_options() -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        # asyncpg's own statement cache and SQLAlchemy's prepared statement cache on the adapter
+        "statement_cache_size": settings.postgres_statement_cache_size,
+        "prepared_statement_cache_size": settings.postgres_statement_cache_size,
+        "timeout": settings.postgres_connect_timeout,
+    }
+    if settings.postgres_command_timeout is not None:
+        connect_args["command_timeout"] = settings.postgres_command_timeout
+
+    return {
+        "pool_size": settings.postgres_pool_size,
+        "max_overflow": settings.postgres_max_overflow,
+        "pool_timeout": settings.postgres_pool_timeout,
+        "pool_recycle": settings.postgres_pool_recycle,
+        "pool_pre_ping": settings.postgres_pool_pre_ping,
+        "pool_use_lifo": settings.postgres_pool_use_lifo,
+        "connect_args": connect_args,
+    }
+
+
+# Create an engine whose pool reports metrics under `name`
+def create_instrumented_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(url, echo=False, future=True, poolclass=instrumented_pool_class(name), **_engine_options())
+    instrument_engine(engine, name)
+    return engine
+
+
+async_engine: AsyncEngine = create_instrumented_engine(_conn_str, "primary")
 
 async_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
     autocommit=False,
@@ -1,7 +1,15 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from src.app.core.config import settings
 from src.app.core.logger import get_logger
+from src.app.core.metrics import metrics
+from .database import async_engine
 
 _logger = get_logger(__name__)
 
@@ -13,3 +21,119 @@ async def check_database_health(db: AsyncSession) -> bool:
     except Exception as ex:
         _logger.exception("Database health check failed: %s", ex)
         return False
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseHealth:
+    healthy: bool
+    checked_at: Optional[float] = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the probe finished (monotonic clock)."""
+
+        return None if self.checked_at is None else time.monotonic() - self.checked_at
+
+
+@dataclass(frozen=True, slots=True)
+class PoolUsage:
+    size: int
+    checked_out: int
+    overflow: int
+    # None when overflow is unlimited
+    capacity: Optional[int]
+
+    @property
+    def saturation(self) -> Optional[float]:
+        return None if not self.capacity else self.checked_out / self.capacity
+
+
+def pool_usage(engine: AsyncEngine = async_engine) -> PoolUsage:
+    pool = engine.pool
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    return PoolUsage(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        capacity=pool.size() + max_overflow if max_overflow >= 0 else None,
+    )
+
+
+class DatabaseHealthProber:
+    """
+    Probes the database on an interval in the background and keeps the latest result,
+    so health endpoints answer from memory instead of checking out a connection per call.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float, timeout: float) -> None:
+        if interval <= 0 or timeout <= 0:
+            raise ValueError("Interval and timeout must be greater than 0")
+
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+
+        self.status = DatabaseHealth(healthy=False, error="Not probed yet")
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Latest probe succeeded and is recent enough to trust."""
+
+        age = self.status.age
+        return self.status.healthy and age is not None and age <= self.max_age
+
+    @property
+    def max_age(self) -> float:
+        # A few missed rounds before the cached result stops counting
+        return 3 * self.interval + self.timeout
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="db-health-prober")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def probe(self) -> DatabaseHealth:
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        except Exception as ex:
+            status = DatabaseHealth(healthy=False, checked_at=time.monotonic(), error=f"{type(ex).__name__}: {ex}")
+        else:
+            status = DatabaseHealth(healthy=True, checked_at=time.monotonic(), latency_ms=(time.perf_counter() - start) * 1000)
+
+        # Log the first result and transitions only; a down database would otherwise log every interval
+        if self.status.checked_at is None or status.healthy != self.status.healthy:
+            if status.healthy:
+                _logger.info("Database is reachable (%.1f ms)", status.latency_ms)
+            else:
+                _logger.error("Database health check failed: %s", status.error)
+
+        self.status = status
+        return status
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+
+database_prober = DatabaseHealthProber(
+    async_engine,
+    interval=settings.health_probe_interval,
+    timeout=settings.health_probe_timeout,
+)
+
+metrics.callback("db_healthy", "1 when the latest background database probe succeeded", lambda: int(database_prober.healthy))
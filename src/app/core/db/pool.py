@@ -0,0 +1,104 @@
+import time
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+from src.app.core.metrics import metrics
+
+# Engines whose pools are reported at scrape time, by pool label
+_instrumented_engines: dict[str, AsyncEngine] = {}
+
+db_pool_waiters = metrics.gauge(
+    "db_pool_waiters",
+    "Checkouts currently blocked waiting for a pooled connection",
+    ("pool",),
+)
+db_pool_checkout_wait = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent taking a connection from the pool queue",
+    ("pool",),
+)
+db_pool_checkout_timeouts = metrics.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after the pool timeout",
+    ("pool",),
+)
+db_pool_connections_created = metrics.counter(
+    "db_pool_connections_created_total",
+    "New DBAPI connections opened by the pool",
+    ("pool",),
+)
+db_pool_invalidations = metrics.counter(
+    "db_pool_invalidations_total",
+    "Connections invalidated (disconnects, failed pre-pings)",
+    ("pool",),
+)
+
+
+def _pool_gauge(read: Callable[[AsyncAdaptedQueuePool], int]) -> Callable[[], dict[tuple[str, ...], float]]:
+    # Engine.pool is replaced on dispose(), so resolve it at scrape time
+    return lambda: {(name,): read(engine.pool) for name, engine in _instrumented_engines.items()}
+
+
+metrics.callback("db_pool_size", "Configured persistent connections", _pool_gauge(lambda pool: pool.size()), ("pool",))
+metrics.callback("db_pool_checked_out", "Connections currently checked out", _pool_gauge(lambda pool: pool.checkedout()), ("pool",))
+metrics.callback("db_pool_checked_in", "Idle connections in the pool", _pool_gauge(lambda pool: pool.checkedin()), ("pool",))
+metrics.callback("db_pool_overflow", "Connections open beyond pool size (negative while below it)", _pool_gauge(lambda pool: pool.overflow()), ("pool",))
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times gets from its connection queue.
+    Blocking gets only happen once size + overflow are exhausted, so they are the waiters;
+    the wait-time histogram also records the non-blocking gets so its count equals checkouts.
+    """
+
+    pool_name = "primary"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        queue_get = self._pool.get
+        labels = (self.pool_name,)
+
+        def timed_get(block: bool = True, timeout: float | None = None):
+            start = time.perf_counter()
+            if block:
+                db_pool_waiters.inc(labels)
+            try:
+                return queue_get(block, timeout)
+            except sqla_queue.Empty:
+                if block:
+                    db_pool_checkout_timeouts.inc(labels)
+                raise
+            finally:
+                if block:
+                    db_pool_waiters.dec(labels)
+                db_pool_checkout_wait.observe(labels, time.perf_counter() - start)
+
+        self._pool.get = timed_get
+
+
+# Pool class reporting under `name`; recreate() uses self.__class__, so the label survives dispose()
+def instrumented_pool_class(name: str) -> type[InstrumentedAsyncPool]:
+    return type(f"InstrumentedAsyncPool[{name}]", (InstrumentedAsyncPool,), {"pool_name": name})
+
+
+# Publish pool gauges and lifecycle counters for an engine built with instrumented_pool_class(name)
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    labels = (name,)
+    _instrumented_engines[name] = engine
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        db_pool_connections_created.inc(labels)
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception: BaseException | None) -> None:
+        db_pool_invalidations.inc(labels)
+
+
+__all__ = ["InstrumentedAsyncPool", "instrument_engine", "instrumented_pool_class"]
@@ -0,0 +1,245 @@
+import itertools
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.app.core.config import ReplicaSelection, settings
+from src.app.core.logger import get_logger
+from src.app.core.metrics import metrics
+from .database import async_engine, create_instrumented_engine
+from .health import DatabaseHealthProber
+
+_logger = get_logger(__name__)
+
+db_reads = metrics.counter(
+    "db_read_sessions_total",
+    "Reader sessions by the engine they were routed to",
+    ("target",),
+)
+
+
+###########################################
+# Replicas
+###########################################
+class Replica:
+    """A read replica engine with its background prober and passive failure tracking."""
+
+    def __init__(self, name: str, engine: AsyncEngine, prober: DatabaseHealthProber) -> None:
+        self.name = name
+        self.engine = engine
+        self.prober = prober
+
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self.prober.healthy and time.monotonic() >= self.ejected_until
+
+    @property
+    def checked_out(self) -> int:
+        return self.engine.pool.checkedout()
+
+
+class ReplicaRouter:
+    """
+    Chooses a replica for reads. Replicas are used only while their prober reports them healthy;
+    consecutive connection errors eject one for a cool-down even between probes.
+    With no replica available, reads go to the primary.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Replica],
+        selection: ReplicaSelection,
+        eject_after: int,
+        eject_seconds: float,
+    ) -> None:
+        self.replicas = list(replicas)
+        self.selection = selection
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+
+        self._round_robin = itertools.count()
+
+        for replica in self.replicas:
+            self._watch_errors(replica)
+
+    def choose(self) -> Optional[Replica]:
+        available = [replica for replica in self.replicas if replica.available]
+        if not available:
+            return None
+        if self.selection == ReplicaSelection.LEAST_CONNECTIONS:
+            return min(available, key=lambda replica: replica.checked_out)
+        return available[next(self._round_robin) % len(available)]
+
+    def record_failure(self, replica: Replica) -> None:
+        replica.failures += 1
+        if replica.failures >= self.eject_after:
+            replica.failures = 0
+            replica.ejected_until = time.monotonic() + self.eject_seconds
+            _logger.warning("Ejecting read replica %s for %.0fs after repeated connection errors", replica.name, self.eject_seconds)
+
+    def start(self) -> None:
+        for replica in self.replicas:
+            replica.prober.start()
+
+    async def stop(self) -> None:
+        for replica in self.replicas:
+            await replica.prober.stop()
+            await replica.engine.dispose()
+
+    def _watch_errors(self, replica: Replica) -> None:
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _on_error(context) -> None:
+            if context.is_disconnect:
+                self.record_failure(replica)
+
+        # Any successful checkout ends a run of failures
+        @event.listens_for(replica.engine.sync_engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            replica.failures = 0
+
+
+# Replica DSNs may be given without the async driver
+def _async_dsn(url: str) -> str:
+    for prefix in (settings.postgres_sync_prefix, "postgres://"):
+        if url.startswith(prefix):
+            return settings.postgres_async_prefix + url[len(prefix) :]
+    return url
+
+
+def _build_router() -> ReplicaRouter:
+    replicas = []
+    for index, url in enumerate(settings.postgres_replica_urls):
+        name = f"replica{index}"
+        engine = create_instrumented_engine(_async_dsn(url), name)
+        prober = DatabaseHealthProber(engine, interval=settings.health_probe_interval, timeout=settings.health_probe_timeout)
+        replicas.append(Replica(name, engine, prober))
+
+    return ReplicaRouter(
+        replicas,
+        selection=settings.postgres_replica_selection,
+        eject_after=settings.postgres_replica_eject_after,
+        eject_seconds=settings.postgres_replica_eject_seconds,
+    )
+
+
+replica_router = _build_router()
+
+metrics.callback(
+    "db_replica_available",
+    "1 while a read replica is healthy and not ejected",
+    lambda: {(replica.name,): int(replica.available) for replica in replica_router.replicas},
+    ("replica",),
+)
+
+
+###########################################
+# Request-scoped routing
+###########################################
+@dataclass(slots=True)
+class RequestRouting:
+    """Per-request routing state shared by the reader and writer sessions of one request."""
+
+    # Set once the writer session flushes or executes a write; later reads go to the primary (read-your-writes)
+    wrote: bool = False
+    # First replica chosen; kept for the request so successive reads see one consistent replica
+    replica: Optional[Replica] = None
+    resolved: bool = False
+
+
+class ReaderSession(Session):
+    """Binds to a replica, or to the primary when none is available or the request has written."""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+        routing: RequestRouting = self.info["routing"]
+        if routing.wrote:
+            return async_engine.sync_engine
+
+        if not routing.resolved:
+            routing.replica = replica_router.choose()
+            routing.resolved = True
+            db_reads.inc((routing.replica.name if routing.replica else "primary",))
+
+        engine = routing.replica.engine if routing.replica is not None else async_engine
+        return engine.sync_engine
+
+
+class WriterSession(Session):
+    """Always bound to the primary; any write through it marks the request for read-your-writes."""
+
+
+def _mark_written(session: Session) -> None:
+    routing: Optional[RequestRouting] = session.info.get("routing")
+    if routing is not None and settings.postgres_read_your_writes:
+        routing.wrote = True
+
+
+# ORM unit-of-work writes
+@event.listens_for(WriterSession, "after_flush")
+def _mark_flushed(session: Session, flush_context) -> None:
+    _mark_written(session)
+
+
+# Core DML through session.execute (update(...).returning(), insert, delete) never flushes
+@event.listens_for(WriterSession, "do_orm_execute")
+def _mark_executed(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        _mark_written(orm_execute_state.session)
+
+
+_session_options = dict(autocommit=False, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+async_reader_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(sync_session_class=ReaderSession, **_session_options)
+async_writer_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(bind=async_engine, sync_session_class=WriterSession, **_session_options)
+
+
+def request_routing(request: Request) -> RequestRouting:
+    routing = getattr(request.state, "db_routing", None)
+    if routing is None:
+        routing = request.state.db_routing = RequestRouting()
+    return routing
+
+
+async def async_get_reader_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only work; routed to a replica when one is available."""
+
+    async with async_reader_session_factory(info={"routing": request_routing(request)}) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def async_get_writer_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the primary; once it writes, reader sessions of the same request use the primary too."""
+
+    async with async_writer_session_factory(info={"routing": request_routing(request)}) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+__all__ = [
+    "async_get_reader_db",
+    "async_get_writer_db",
+    "async_reader_session_factory",
+    "async_writer_session_factory",
+    "ReaderSession",
+    "Replica",
+    "ReplicaRouter",
+    "replica_router",
+    "RequestRouting",
+    "WriterSession",
+]
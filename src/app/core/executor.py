@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from src.app.core.config import ExecutorMode, settings
+from src.app.core.logger import get_logger
+from src.app.core.metrics import metrics
+
+_logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorQueueFullError(RuntimeError):
+    """Raised when a job is submitted while the executor queue is at capacity."""
+
+
+class RenderExecutor:
+    """Runs CPU-bound work off the event loop with a bounded number of pending jobs."""
+
+    def __init__(self, mode: ExecutorMode, max_workers: Optional[int], max_queue: int) -> None:
+        if max_queue < 1:
+            raise ValueError("Max queue must be greater than 0")
+
+        self.mode = mode
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self, initializer: Optional[Callable[..., object]] = None, initargs: tuple = ()) -> None:
+        """Create the worker pool; `initializer` runs once in every worker (or once inline)."""
+
+        if self._pool is not None:
+            return
+
+        if self.mode == ExecutorMode.INLINE:
+            if initializer is not None:
+                initializer(*initargs)
+            return
+
+        if self.mode == ExecutorMode.PROCESS:
+            # Spawned workers do not inherit the running event loop or open sockets
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+                initargs=initargs,
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="render",
+                initializer=initializer,
+                initargs=initargs,
+            )
+
+        _logger.verbose("Render executor started (mode=%s, workers=%s, max_queue=%s)", self.mode, self.max_workers, self.max_queue)
+
+    async def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+
+        await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+        _logger.verbose("Render executor stopped")
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await `fn(*args, **kwargs)` on the executor, failing fast when the queue is full."""
+
+        if self._pending >= self.max_queue:
+            raise ExecutorQueueFullError(f"Render queue is full ({self._pending}/{self.max_queue})")
+
+        self._pending += 1
+        try:
+            if self.mode == ExecutorMode.INLINE:
+                return fn(*args, **kwargs)
+
+            # Lazily start when used outside the application lifespan
+            if self._pool is None:
+                self.start()
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+        finally:
+            self._pending -= 1
+
+
+render_executor = RenderExecutor(
+    mode=settings.render_executor_mode,
+    max_workers=settings.render_executor_workers,
+    max_queue=settings.render_executor_max_queue,
+)
+
+metrics.callback("render_executor_pending", "Render jobs queued or running", lambda: render_executor.pending)
+
+__all__ = ["ExecutorQueueFullError", "RenderExecutor", "render_executor"]
@@ -1,11 +1,30 @@
 from fastapi import Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import Response
-from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
+import atexit
+import copy
+import json
 import logging
 import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import socket
 import time
+from datetime import UTC, datetime
+from typing import Any, Optional
 
-from src.app.core.config import settings
+from src.app.core.config import Environment, LogFormat, LogOverflowPolicy, settings
+from src.app.core.metrics import (
+    http_request_bytes,
+    http_request_duration,
+    http_requests_in_flight,
+    http_response_bytes,
+    metrics,
+)
+from src.app.core.serialization import PrecompiledRoute
 
 # Custom log levels
 SILLY_LEVEL = 5
@@ -37,40 +56,192 @@ logging.Logger.silly = _silly
 logging.Logger.verbose = _verbose
 
 
+# Attributes every LogRecord carries; anything else was passed through `extra`
+_RESERVED_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+
+
+# Structured formatter for production
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per record; fields that never change are serialized once."""
+
+    def __init__(self, static_fields: Optional[dict[str, Any]] = None) -> None:
+        super().__init__()
+        encoded = json.dumps(static_fields or {}, separators=(",", ":"), default=str)
+        self._static_prefix = encoded[:-1] + "," if len(encoded) > 2 else "{"
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="microseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "src": f"{record.module}:{record.lineno}",
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                payload[key] = value
+
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+
+        return self._static_prefix + json.dumps(payload, separators=(",", ":"), default=str)[1:]
+
+
+def _json_static_fields() -> dict[str, Any]:
+    return {
+        "app": settings.app_name,
+        "version": settings.app_version,
+        "env": str(settings.environment),
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+    }
+
+
+def _resolve_log_format() -> LogFormat:
+    if settings.log_format is not None:
+        return settings.log_format
+    return LogFormat.JSON if settings.environment == Environment.PRODUCTION else LogFormat.RICH
+
+
+# Queue handler that never grows without bound
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to a bounded queue; on overflow either drops (and counts) or blocks the caller."""
+
+    def __init__(self, log_queue: queue.Queue, overflow: LogOverflowPolicy) -> None:
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now so later mutation of args cannot change it; a copy, since other
+        # handlers on the logger's path still get the caller's record.
+        # exc_info is kept so the console handler can still render rich tracebacks
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == LogOverflowPolicy.BLOCK:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room so stop() cannot fail on a full queue
+        self.queue.put(self._sentinel)
+
+
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[_FlushingQueueListener] = None
+
+
+def start_log_listener() -> None:
+    """Start the background listener if async logging is configured; safe to call repeatedly."""
+
+    if _queue_listener is not None and not _queue_listener.running:
+        _queue_listener.start()
+        logging.getLogger().handlers = [_queue_handler]
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the background listener; later records are written synchronously."""
+
+    if _queue_listener is not None and _queue_listener.running:
+        # Swap the handlers back first, so nothing lands in a queue no thread will read again
+        logging.getLogger().handlers = list(_queue_listener.handlers)
+        _queue_listener.stop()
+
+
+atexit.register(stop_log_listener)
+
+
+def dropped_log_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+metrics.callback("log_records_dropped_total", "Log records dropped on a full queue", dropped_log_records, type_name="counter")
+
+
+def _install_queue_handler() -> None:
+    """Move the configured root handlers behind a queue serviced by a background thread."""
+
+    global _queue_handler, _queue_listener
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, settings.log_queue_overflow)
+    _queue_listener = _FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    # Swaps the root handlers for the queue handler
+    start_log_listener()
+
+
 # Setup logger configuration
 def setup_logger() -> logging.Logger:
-    """Setup logging configuration with colorful output using RichHandler."""
+    """Setup logging configuration; colorful RichHandler output in development, JSON lines in production."""
+
+    log_format = _resolve_log_format()
+
+    if log_format == LogFormat.JSON:
+        formatters = {"json": {"()": JsonFormatter, "static_fields": _json_static_fields()}}
+        console = {
+            "class": "logging.StreamHandler",
+            "level": settings.log_level.upper(),
+            "formatter": "json",
+            "stream": "ext://sys.stdout",
+        }
+    else:
+        formatters = {"rich": {"format": "%(message)s"}}
+        console = {
+            "class": "rich.logging.RichHandler",
+            "level": settings.log_level.upper(),
+            "formatter": "rich",
+            "rich_tracebacks": True,
+            "markup": True,
+            "show_time": True,
+            "show_level": True,
+            "show_path": True,
+            "enable_link_path": True,
+            "log_time_format": "%Y-%m-%d %H:%M:%S.%f",
+        }
 
     config = {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {"rich": {"format": "%(message)s"}},
-        "handlers": {
-            "console": {
-                "class": "rich.logging.RichHandler",
-                "level": settings.log_level.upper(),
-                "formatter": "rich",
-                "rich_tracebacks": True,
-                "markup": True,
-                "show_time": True,
-                "show_level": True,
-                "show_path": True,
-                "enable_link_path": True,
-                "log_time_format": "%Y-%m-%d %H:%M:%S.%f",
-            }
-        },
+        "formatters": formatters,
+        "handlers": {"console": console},
         "root": {"level": settings.log_level.upper(), "handlers": ["console"]},
     }
 
+    stop_log_listener()
     logging.config.dictConfig(config)
 
+    if settings.log_async:
+        _install_queue_handler()
+
     for n in ("uvicorn", "uvicorn.error", "uvicorn.access"):
         lg = logging.getLogger(n)
         lg.propagate = False
         lg.handlers = []
 
     logger = logging.getLogger(settings.app_name)
-    logger.verbose("Logging initialized at level=%s", settings.log_level.upper())
+    logger.verbose("Logging initialized at level=%s format=%s", settings.log_level.upper(), log_format)
 
     return logger
 
@@ -83,15 +254,22 @@ def get_logger(name: str) -> logging.Logger:
 
 
 # Auto-logging route class
-class LoggingRoute(APIRoute):
-    """Auto-log each endpoint invocation."""
+class LoggingRoute(PrecompiledRoute):
+    """
+    Auto-log each endpoint invocation.
+    Only a sample of requests is logged (LOG_REQUEST_SAMPLE_RATE); server errors,
+    unhandled exceptions and requests slower than LOG_SLOW_REQUEST_MS are always logged.
+    Every request is recorded in the HTTP metrics regardless of sampling.
+    """
 
     def get_route_handler(self):
         original_handler = super().get_route_handler()
+        logger = get_logger(settings.app_name)
+        sample_rate = settings.log_request_sample_rate
+        slow_ms = settings.log_slow_request_ms
+        route_path = self.path
 
         async def handler(request: Request) -> Response:
-            logger = get_logger(settings.app_name)
-
             route_name = (
                 getattr(request.scope.get("route"), "name", None)
                 or self.name
@@ -99,40 +277,74 @@ class LoggingRoute(APIRoute):
             )
             method = request.method
             path = request.url.path
+            sampled = sample_rate >= 1.0 or random.random() < sample_rate
+
+            flight_labels = (route_path, method)
+            http_requests_in_flight.inc(flight_labels)
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit():
+                http_request_bytes.inc(flight_labels, int(content_length))
 
             # Endpoint triggered
-            logger.info(
-                "HTTP %s %s -> %s",
-                method,
-                path,
-                route_name,
-            )
+            if sampled:
+                logger.info(
+                    "HTTP %s %s -> %s",
+                    method,
+                    path,
+                    route_name,
+                )
 
             start = time.perf_counter()
             try:
                 response: Response = await original_handler(request)
+            except StarletteHTTPException as ex:
+                # Handled by the exception handlers; record the status the client gets
+                http_request_duration.observe((route_path, method, str(ex.status_code)), time.perf_counter() - start)
+                raise
+            except RequestValidationError:
+                http_request_duration.observe((route_path, method, "422"), time.perf_counter() - start)
+                raise
             except Exception:
+                http_request_duration.observe((route_path, method, "500"), time.perf_counter() - start)
                 # Keep errors visible with traceback
                 logger.exception("Unhandled exception in %s %s", method, path)
                 raise
             finally:
-                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                # Also on cancellation (client gone), which is not an Exception
+                http_requests_in_flight.dec(flight_labels)
+
+            elapsed = time.perf_counter() - start
+            elapsed_ms = elapsed * 1000.0
 
             # Completion details
-            try:
-                status_code = getattr(response, "status_code", "n/a")
-            except Exception:
-                status_code = "n/a"
-            logger.info(
-                "Completed %s %s -> %s in %.2f ms",
-                method,
-                path,
-                status_code,
-                elapsed_ms,
-            )
+            status_code = getattr(response, "status_code", 0)
+            status_label = str(status_code)
+            http_request_duration.observe((route_path, method, status_label), elapsed)
+            body = getattr(response, "body", None)
+            if body is not None:
+                http_response_bytes.inc((route_path, method, status_label), len(body))
+            notable = elapsed_ms >= slow_ms or status_code >= 500
+            if sampled or notable:
+                logger.log(
+                    logging.WARNING if notable else logging.INFO,
+                    "Completed %s %s -> %s in %.2f ms",
+                    method,
+                    path,
+                    status_code or "n/a",
+                    elapsed_ms,
+                    extra={"route": route_name, "method": method, "path": path, "status": status_code, "elapsed_ms": round(elapsed_ms, 3)},
+                )
             return response
 
         return handler
 
 
-__all__ = ["get_logger", "setup_logger", "LoggingRoute"]
+__all__ = [
+    "dropped_log_records",
+    "JsonFormatter",
+    "get_logger",
+    "setup_logger",
+    "start_log_listener",
+    "stop_log_listener",
+    "LoggingRoute",
+]
@@ -0,0 +1,116 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from src.app.core.config import settings
+from src.app.core.logger import get_logger
+from src.app.core.metrics import metrics
+
+_logger = get_logger(__name__)
+
+# Weight of the newest sample in the smoothed lag; smoothing keeps shedding from flapping on one spike
+_SMOOTHING = 0.3
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag by sleeping for a fixed interval and timing how late the wakeup is.
+    A watchdog thread notices when the loop stops ticking for longer than the stall threshold
+    and logs the loop thread's stack while the offending callback is still running.
+    """
+
+    def __init__(self, interval: float, stall_threshold: Optional[float]) -> None:
+        if interval <= 0:
+            raise ValueError("Interval must be greater than 0")
+
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+
+        self.lag = 0.0
+        self.smoothed_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample(), name="loop-lag-monitor")
+
+        if self.stall_threshold:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+            self._watchdog.start()
+
+        _logger.debug("Event loop monitor started (interval %.3fs, stall threshold %ss)", self.interval, self.stall_threshold)
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval + 1)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+
+            self.lag = lag
+            self.smoothed_lag += _SMOOTHING * (lag - self.smoothed_lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        poll = min(self.interval, self.stall_threshold / 2)
+
+        while not self._stopping.wait(poll):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.stall_threshold or heartbeat == reported_heartbeat:
+                continue
+
+            # One report per stall; the heartbeat moves again once the loop recovers
+            reported_heartbeat = heartbeat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>"
+            _logger.warning("Event loop blocked for %.0f ms; loop thread stack:\n%s", stalled * 1000, stack)
+
+
+loop_monitor = LoopLagMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    stall_threshold=settings.loop_monitor_stall_ms / 1000 if settings.loop_monitor_stall_ms else None,
+)
+
+metrics.callback("event_loop_lag_seconds", "Most recent event loop lag sample", lambda: loop_monitor.lag)
+metrics.callback("event_loop_lag_smoothed_seconds", "Smoothed event loop lag used for load shedding", lambda: loop_monitor.smoothed_lag)
+metrics.callback("event_loop_lag_max_seconds", "Largest event loop lag sample since start", lambda: loop_monitor.max_lag)
+metrics.callback("event_loop_stalls_total", "Stalls longer than the stack-dump threshold", lambda: loop_monitor.stalls, type_name="counter")
+
+
+__all__ = ["LoopLagMonitor", "loop_monitor"]
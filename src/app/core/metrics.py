@@ -0,0 +1,254 @@
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Mapping, Sequence
+from typing import Optional, TypeAlias, Union
+
+###########################################
+# Type aliases
+###########################################
+LabelValues: TypeAlias = tuple[str, ...]
+CallbackResult: TypeAlias = Union[float, Mapping[LabelValues, float]]
+
+
+###########################################
+# Bucket layout
+###########################################
+def log_linear_buckets(lowest: float, highest: float, per_octave: int) -> tuple[float, ...]:
+    """
+    HDR-style upper bounds: `per_octave` log-spaced buckets per doubling between lowest and highest.
+    Relative error stays constant across the range, unlike hand-picked linear buckets.
+    """
+
+    count = math.ceil(math.log2(highest / lowest) * per_octave)
+    return tuple(float(f"{lowest * 2 ** (step / per_octave):.6g}") for step in range(count + 1))
+
+
+# 100 µs to ~100 s, two buckets per doubling
+LATENCY_BUCKETS: tuple[float, ...] = log_linear_buckets(0.0001, 100.0, 2)
+
+
+###########################################
+# Metric families
+###########################################
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class MetricFamily(ABC):
+    """
+    Base for a named metric with a fixed set of label names.
+    Updates are plain dict/list operations on the event loop thread; there is no locking.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    @abstractmethod
+    def samples(self) -> list[str]: ...
+
+
+class Counter(MetricFamily):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        self.values[labels] = value
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram(MetricFamily):
+    """Fixed-bucket histogram; observing is a bisect plus three increments."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self.series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            # One slot past the last bound collects the +Inf overflow
+            series = self.series[labels] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+        series.count += 1
+
+    def samples(self) -> list[str]:
+        lines: list[str] = []
+        for labels, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series.total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {series.count}")
+        return lines
+
+
+class CallbackMetric(MetricFamily):
+    """Value read at scrape time, for state that already lives elsewhere (queues, caches, pools)."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], CallbackResult],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type_name = type_name
+
+    def samples(self) -> list[str]:
+        result = self.callback()
+        if not isinstance(result, Mapping):
+            result = {(): result}
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(float(value))}" for labels, value in result.items()]
+
+
+###########################################
+# Registry
+###########################################
+class MetricsRegistry:
+    """Per-worker collection of metric families rendered in the Prometheus text format."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily] = {}
+
+    def register(self, family: MetricFamily) -> MetricFamily:
+        # Re-registering returns the existing family so module reloads do not duplicate series
+        return self._families.setdefault(family.name, family)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], CallbackResult],
+        labelnames: Sequence[str] = (),
+        type_name: str = "gauge",
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, callback, labelnames, type_name))
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family in self._families.values():
+            samples = family.samples()
+            if samples:
+                lines.extend(family.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+###########################################
+# HTTP metrics recorded by LoggingRoute
+###########################################
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Handler latency by route template, method and status",
+    ("route", "method", "status"),
+)
+http_requests_in_flight = metrics.gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    ("route", "method"),
+)
+http_request_bytes = metrics.counter(
+    "http_request_bytes_total",
+    "Request body bytes as declared by Content-Length",
+    ("route", "method"),
+)
+http_response_bytes = metrics.counter(
+    "http_response_bytes_total",
+    "Response body bytes for fully-materialized responses",
+    ("route", "method", "status"),
+)
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "CallbackMetric",
+    "LATENCY_BUCKETS",
+    "MetricsRegistry",
+    "http_request_bytes",
+    "http_request_duration",
+    "http_requests_in_flight",
+    "http_response_bytes",
+    "log_linear_buckets",
+    "metrics",
+]
@@ -0,0 +1,266 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+
+from src.app.core.config import settings
+from src.app.core.metrics import metrics
+
+# Endpoint attribute carrying the policy; routes copied by include_router keep the same endpoint
+_POLICY_ATTRIBUTE = "response_cache"
+
+response_cache_purged = metrics.counter("http_response_cache_purged_total", "Responses dropped by surrogate-key purges")
+
+
+###########################################
+# Opt-in
+###########################################
+@dataclass(frozen=True, slots=True)
+class ResponseCachePolicy:
+    # Seconds to keep responses that carry no max-age/s-maxage of their own; None stores only those that do
+    ttl: Optional[float] = None
+    # Formatted with the route's path parameters, e.g. "user:{id}"
+    surrogate_keys: tuple[str, ...] = ()
+    # Request headers the response varies on beyond those listed in its own Vary header
+    vary: tuple[str, ...] = ()
+    # Upper bound on the stored lifetime, for responses whose max-age outlives what this cache can invalidate
+    max_ttl: Optional[float] = None
+
+
+def cache_response(
+    ttl: Optional[float] = None,
+    *,
+    surrogate_keys: Sequence[str] = (),
+    vary: Sequence[str] = (),
+    max_ttl: Optional[float] = None,
+):
+    """Opt a GET endpoint into ResponseCacheMiddleware."""
+
+    policy = ResponseCachePolicy(ttl=ttl, surrogate_keys=tuple(surrogate_keys), vary=tuple(name.lower() for name in vary), max_ttl=max_ttl)
+
+    def decorator(endpoint):
+        setattr(endpoint, _POLICY_ATTRIBUTE, policy)
+        return endpoint
+
+    return decorator
+
+
+def cache_router(
+    router: APIRouter,
+    ttl: Optional[float] = None,
+    *,
+    surrogate_keys: Sequence[str] = (),
+    vary: Sequence[str] = (),
+    max_ttl: Optional[float] = None,
+) -> APIRouter:
+    """Opt every GET route of a router in; applied to the routes when API discovery includes the router."""
+
+    router.response_cache = ResponseCachePolicy(
+        ttl=ttl,
+        surrogate_keys=tuple(surrogate_keys),
+        vary=tuple(name.lower() for name in vary),
+        max_ttl=max_ttl,
+    )
+    return router
+
+
+# Copy a router-level policy onto its GET endpoints that have none of their own
+def apply_router_policy(router: APIRouter) -> None:
+    policy: Optional[ResponseCachePolicy] = getattr(router, _POLICY_ATTRIBUTE, None)
+    if policy is None:
+        return
+    for route in router.routes:
+        if isinstance(route, APIRoute) and "GET" in route.methods and route_policy(route) is None:
+            setattr(route.endpoint, _POLICY_ATTRIBUTE, policy)
+
+
+def route_policy(route: object) -> Optional[ResponseCachePolicy]:
+    endpoint = getattr(route, "endpoint", None)
+    return getattr(endpoint, _POLICY_ATTRIBUTE, None) if endpoint is not None else None
+
+
+###########################################
+# Cache-Control
+###########################################
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    """Directive name (lowercased) to its argument, or None for bare directives."""
+
+    directives: dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def directive_seconds(directives: dict[str, Optional[str]], name: str) -> Optional[int]:
+    value = directives.get(name)
+    if value is None or not value.isdigit():
+        return None
+    return int(value)
+
+
+###########################################
+# Store
+###########################################
+@dataclass(slots=True)
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: Optional[str]
+    stored_at: float
+    expires_at: float
+    surrogate_keys: frozenset[str] = field(default_factory=frozenset)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers) + 128
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class ResponseCache:
+    """
+    Per-worker store of complete responses, bounded by entry count and total bytes (LRU).
+    Entries are keyed by method-independent URL plus the values of the request headers named in Vary;
+    surrogate keys index entries so related responses can be purged together.
+    Purges only reach this worker's store.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("Cache limits must be greater than or equal to 0")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._size_bytes = 0
+        # Vary header names per URL and how many stored variants use them
+        self._vary: dict[str, tuple[tuple[str, ...], int]] = {}
+        self._surrogates: dict[str, set[tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def get(self, url: str, headers: Headers) -> Optional[CachedResponse]:
+        vary = self._vary.get(url)
+        if vary is None:
+            return None
+
+        key = (url, _vary_values(vary[0], headers))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, url: str, vary_names: Iterable[str], headers: Headers, entry: CachedResponse) -> bool:
+        if entry.size > self.max_bytes or self.max_entries == 0:
+            return False
+
+        names = tuple(sorted({name.lower() for name in vary_names}))
+        current = self._vary.get(url)
+        if current is not None and current[0] != names:
+            # The resource changed what it varies on; older variants are keyed differently
+            self._purge_url(url)
+
+        key = (url, _vary_values(names, headers))
+        if key in self._entries:
+            self._remove(key)
+
+        count = self._vary.get(url, (names, 0))[1]
+        self._vary[url] = (names, count + 1)
+        self._entries[key] = entry
+        self._size_bytes += entry.size
+        for surrogate_key in entry.surrogate_keys:
+            self._surrogates.setdefault(surrogate_key, set()).add(key)
+
+        while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        return True
+
+    def purge(self, *surrogate_keys: str) -> int:
+        """Drop every response tagged with any of the keys; returns how many were dropped."""
+
+        keys = set().union(*(self._surrogates.get(surrogate_key, ()) for surrogate_key in surrogate_keys))
+        for key in keys:
+            self._remove(key)
+        if keys:
+            response_cache_purged.inc(amount=len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._vary.clear()
+        self._surrogates.clear()
+        self._size_bytes = 0
+
+    def _purge_url(self, url: str) -> None:
+        for key in [key for key in self._entries if key[0] == url]:
+            self._remove(key)
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        self._size_bytes -= entry.size
+        names, count = self._vary[key[0]]
+        if count <= 1:
+            del self._vary[key[0]]
+        else:
+            self._vary[key[0]] = (names, count - 1)
+
+        for surrogate_key in entry.surrogate_keys:
+            members = self._surrogates.get(surrogate_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._surrogates[surrogate_key]
+
+
+def _vary_values(names: tuple[str, ...], headers: Headers) -> tuple[Optional[str], ...]:
+    return tuple(", ".join(headers.getlist(name)) or None for name in names)
+
+
+response_cache = ResponseCache(max_entries=settings.response_cache_max_entries, max_bytes=settings.response_cache_max_bytes)
+
+metrics.callback("http_response_cache_entries", "Responses held by the response cache", lambda: len(response_cache))
+metrics.callback("http_response_cache_bytes", "Approximate bytes held by the response cache", lambda: response_cache.size_bytes)
+
+
+# Drop cached responses tagged with any of the surrogate keys; call after the write commits
+def purge_responses(*surrogate_keys: str) -> int:
+    return response_cache.purge(*surrogate_keys)
+
+
+__all__ = [
+    "apply_router_policy",
+    "cache_response",
+    "cache_router",
+    "CachedResponse",
+    "directive_seconds",
+    "parse_cache_control",
+    "purge_responses",
+    "response_cache",
+    "ResponseCache",
+    "ResponseCachePolicy",
+    "route_policy",
+]
@@ -0,0 +1,117 @@
+import typing
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+_LIST_ORIGINS = (list, Sequence, typing.Sequence)
+
+
+class RawJSON(bytes):
+    """Already-serialized JSON body; PrecompiledJSONResponse sends it as-is."""
+
+
+# One adapter per type; building the core schema is the expensive part
+@lru_cache(maxsize=None)
+def type_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def dump_json(value: Any, annotation: Any = None, *, by_alias: bool = True, **kwargs: Any) -> RawJSON:
+    """
+    Serialize straight to JSON bytes through the cached adapter for `annotation` (the value's type
+    when omitted), so BaseSchema's camelCase aliases apply without building an intermediate dict.
+    """
+
+    adapter = type_adapter(annotation if annotation is not None else type(value))
+    return RawJSON(adapter.dump_json(value, by_alias=by_alias, **kwargs))
+
+
+def dump_json_list(items: Sequence[Any], model: type[BaseModel], *, by_alias: bool = True, **kwargs: Any) -> RawJSON:
+    """Bulk path for a list of model instances: one serializer call for the whole array."""
+
+    return dump_json(items, list[model], by_alias=by_alias, **kwargs)
+
+
+class PrecompiledJSONResponse(JSONResponse):
+    """JSONResponse that passes pre-serialized bytes through and encodes anything else with pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def _is_trusted(value: Any, annotation: Any) -> bool:
+    """
+    True when the value already is what the response model describes: an instance of exactly that
+    model (validated when it was built from the row), or a list of them. Subclass instances are not
+    trusted, so a model with extra fields is still revalidated down to the declared one.
+    """
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return type(value) is annotation
+
+    origin = typing.get_origin(annotation)
+    if origin in _LIST_ORIGINS and isinstance(value, list):
+        (item,) = typing.get_args(annotation) or (None,)
+        return isinstance(item, type) and issubclass(item, BaseModel) and all(type(element) is item for element in value)
+
+    return False
+
+
+class _PrecompiledField:
+    """
+    Stands in for the route's response ModelField inside FastAPI's request handler.
+    Trusted values skip validation; everything is serialized once, directly to bytes.
+    """
+
+    def __init__(self, field: Any) -> None:
+        self.field = field
+        self.annotation = field.field_info.annotation
+        self.adapter = type_adapter(self.annotation)
+
+    def validate(self, value: Any, values: dict[str, Any] = {}, *, loc: tuple = ()) -> tuple[Any, Optional[list]]:
+        if _is_trusted(value, self.annotation):
+            return value, None
+        return self.field.validate(value, values, loc=loc)
+
+    def serialize(self, value: Any, *, mode: str = "json", **kwargs: Any) -> RawJSON:
+        return RawJSON(self.adapter.dump_json(value, **kwargs))
+
+
+class PrecompiledRoute(APIRoute):
+    """
+    Base route for the project. Routes with a response model and a JSON response class serialize the
+    endpoint result with a cached TypeAdapter straight to bytes, instead of FastAPI validating it again,
+    converting it to a dict with jsonable data and then running json.dumps over that.
+    Routes with their own response class (binary, streaming) keep FastAPI's behavior.
+    """
+
+    def get_route_handler(self):
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+            # The framework default; the precompiled response renders the same JSON
+            if response_class is JSONResponse:
+                response_class = PrecompiledJSONResponse
+                self.response_class = DefaultPlaceholder(PrecompiledJSONResponse)
+
+        field = self.secure_cloned_response_field
+        if field is None or not issubclass(response_class, PrecompiledJSONResponse):
+            return super().get_route_handler()
+
+        # The OpenAPI schema keeps reading the real field from the route
+        self.secure_cloned_response_field = _PrecompiledField(field)
+        try:
+            return super().get_route_handler()
+        finally:
+            self.secure_cloned_response_field = field
+
+
+__all__ = ["dump_json", "dump_json_list", "PrecompiledJSONResponse", "PrecompiledRoute", "RawJSON", "type_adapter"]
@@ -0,0 +1,133 @@
+import asyncio
+import copy
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Generic, Optional, TypeVar
+
+from fastapi import HTTPException, Request, Response, status
+
+from src.app.core.config import settings
+from src.app.core.logger import get_logger, LoggingRoute
+from src.app.core.metrics import metrics
+from src.app.core.serialization import PrecompiledRoute
+
+_logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_COALESCED_METHODS = frozenset({"GET", "HEAD"})
+
+http_coalesced_requests = metrics.counter(
+    "http_coalesced_requests_total",
+    "Requests answered by another in-flight execution of the same request",
+    ("route",),
+)
+
+
+class SingleFlightTimeoutError(TimeoutError):
+    """Raised when a waiter gives up on a shared call that is still running."""
+
+
+class SingleFlight(Generic[T]):
+    """
+    Collapses concurrent calls with the same key into one execution.
+    The call runs in its own task, so a waiter that times out or is cancelled does not
+    cancel it for the others; its result or exception is delivered to every waiter.
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = timeout
+        self._calls: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return the call result and whether it was shared with an earlier caller."""
+
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout), shared
+        except asyncio.TimeoutError:
+            raise SingleFlightTimeoutError(f"Shared call did not finish within {self.timeout}s") from None
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Nobody may be waiting anymore; mark the exception as retrieved
+        if not task.cancelled():
+            task.exception()
+
+
+# Identity of a request for coalescing purposes
+def request_key(request: Request, vary_headers: Sequence[str]) -> tuple:
+    """Method, path, query with parameters sorted, and the request headers the response varies on."""
+
+    query = tuple(sorted(request.query_params.multi_items()))
+    headers = tuple(request.headers.get(name) for name in vary_headers)
+    return request.method, request.url.path, query, headers
+
+
+def _clone_response(response: Response) -> Response:
+    """Per-waiter copy with its own header list; background tasks run for the original only."""
+
+    clone = copy.copy(response)
+    clone.raw_headers = list(response.raw_headers)
+    vars(clone).pop("_headers", None)
+    clone.background = None
+    return clone
+
+
+class CoalescingRoute(PrecompiledRoute):
+    """
+    Opt-in single-flight for GET and HEAD: identical concurrent requests share one handler run.
+    Only fully-materialized responses can be fanned out; when the shared run produced a
+    streaming response, waiters other than the first re-run the handler themselves.
+    """
+
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+        flight: SingleFlight[Response] = SingleFlight(timeout=settings.single_flight_timeout)
+        vary_headers = tuple(name.lower() for name in settings.single_flight_vary_headers)
+        route_path = self.path
+
+        async def handler(request: Request) -> Response:
+            if request.method not in _COALESCED_METHODS:
+                return await original_handler(request)
+
+            try:
+                response, shared = await flight.do(request_key(request, vary_headers), lambda: original_handler(request))
+            except SingleFlightTimeoutError as ex:
+                _logger.warning("Coalesced request %s %s timed out: %s", request.method, request.url.path, ex)
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail="Timed out waiting for an identical in-flight request",
+                )
+
+            if not shared:
+                return response
+            if getattr(response, "body", None) is None:
+                return await original_handler(request)
+
+            http_coalesced_requests.inc((route_path,))
+            return _clone_response(response)
+
+        return handler
+
+
+class SingleFlightRoute(LoggingRoute, CoalescingRoute):
+    """LoggingRoute on the outside, so every coalesced request is still logged and measured."""
+
+
+__all__ = [
+    "CoalescingRoute",
+    "SingleFlight",
+    "SingleFlightRoute",
+    "SingleFlightTimeoutError",
+    "request_key",
+]
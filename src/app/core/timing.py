@@ -0,0 +1,85 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Server-Timing metric names are HTTP tokens; keep descriptions free of quotes
+_TOKEN_INVALID = set(' "(),/:;<=>?@[\\]{}')
+
+
+class ServerTiming:
+    """Named phase durations (in milliseconds) collected while handling one request."""
+
+    __slots__ = ("_phases",)
+
+    def __init__(self) -> None:
+        # name -> [total duration ms, description]
+        self._phases: dict[str, list] = {}
+
+    def record(self, name: str, duration_ms: float, description: Optional[str] = None) -> None:
+        """Add a duration to a phase; repeated phases (e.g. several queries) accumulate."""
+
+        if not name or _TOKEN_INVALID.intersection(name):
+            raise ValueError(f"Invalid Server-Timing metric name: {name!r}")
+
+        phase = self._phases.get(name)
+        if phase is None:
+            self._phases[name] = [duration_ms, description]
+        else:
+            phase[0] += duration_ms
+            if description is not None:
+                phase[1] = description
+
+    @contextmanager
+    def measure(self, name: str, description: Optional[str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, description)
+
+    def phases(self) -> dict[str, float]:
+        return {name: phase[0] for name, phase in self._phases.items()}
+
+    def header_value(self) -> str:
+        entries = []
+        for name, (duration_ms, description) in self._phases.items():
+            entry = f"{name};dur={duration_ms:.3f}"
+            if description:
+                entry += f';desc="{description.replace(chr(34), "")}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._phases)
+
+
+_current_timing: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+# Timing collector of the current request; a detached one outside requests so callers never branch
+def current_timing() -> ServerTiming:
+    timing = _current_timing.get()
+    return timing if timing is not None else ServerTiming()
+
+
+# Collect timings of everything run inside the block into a fresh ServerTiming, e.g. one per request
+@contextmanager
+def request_timing() -> Iterator[ServerTiming]:
+    timing = ServerTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+# Time a block into the current request's Server-Timing header, e.g. `with timed("db"): ...`
+@contextmanager
+def timed(name: str, description: Optional[str] = None) -> Iterator[None]:
+    with current_timing().measure(name, description):
+        yield
+
+
+__all__ = ["ServerTiming", "current_timing", "request_timing", "timed"]
@@ -0,0 +1,115 @@
+import json
+from collections.abc import Mapping, Sequence
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.app.core.loop_monitor import LoopLagMonitor
+from src.app.core.metrics import metrics
+
+http_requests_shed = metrics.counter(
+    "http_requests_shed_total",
+    "Requests rejected by admission control",
+    ("group", "reason"),
+)
+admission_in_flight = metrics.gauge(
+    "admission_in_flight",
+    "Admitted requests currently running per route group",
+    ("group",),
+)
+
+_DEFAULT_GROUP = "default"
+
+
+class AdmissionControlMiddleware:
+    """
+    Rejects requests up front instead of letting latency spiral.
+    503 when the event loop lag is above the threshold (the whole worker is saturated),
+    429 when a route group is at its in-flight limit. Exempt paths (probes, metrics) always pass.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        monitor: LoopLagMonitor,
+        max_loop_lag: Optional[float] = 0.5,
+        group_limits: Optional[Mapping[str, int]] = None,
+        default_limit: Optional[int] = None,
+        exempt_paths: Sequence[str] = ("/health",),
+        retry_after: int = 1,
+    ) -> None:
+        self.app = app
+        self.monitor = monitor
+        self.max_loop_lag = max_loop_lag
+        self.default_limit = default_limit
+        self.exempt_paths = tuple(exempt_paths)
+        self.retry_after = str(retry_after)
+
+        # Longest prefix first so nested groups win over their parents
+        self.group_limits = sorted((group_limits or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._in_flight: dict[str, int] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = self._route_path(scope)
+        if path.startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        group, limit = self._group(path)
+
+        if self.max_loop_lag is not None and self.monitor.smoothed_lag > self.max_loop_lag:
+            http_requests_shed.inc((group, "loop_lag"))
+            await self._reject(send, 503, "Server is overloaded, retry shortly")
+            return
+
+        in_flight = self._in_flight.get(group, 0)
+        if limit is not None and in_flight >= limit:
+            http_requests_shed.inc((group, "concurrency"))
+            await self._reject(send, 429, "Too many concurrent requests, retry shortly")
+            return
+
+        self._in_flight[group] = in_flight + 1
+        admission_in_flight.set((group,), in_flight + 1)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight[group] -= 1
+            admission_in_flight.set((group,), self._in_flight[group])
+
+    @staticmethod
+    def _route_path(scope: Scope) -> str:
+        # Starlette keeps root_path inside path; groups are configured relative to the app
+        path: str = scope["path"]
+        root_path: str = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        return path or "/"
+
+    def _group(self, path: str) -> tuple[str, Optional[int]]:
+        for prefix, limit in self.group_limits:
+            if path.startswith(prefix):
+                return prefix, limit
+        return _DEFAULT_GROUP, self.default_limit
+
+    async def _reject(self, send: Send, status_code: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", self.retry_after.encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+__all__ = ["AdmissionControlMiddleware"]
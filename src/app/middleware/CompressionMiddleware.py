@@ -0,0 +1,269 @@
+import weakref
+import zlib
+from collections.abc import Callable, Sequence
+from typing import Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.core.metrics import metrics
+from src.app.services.render_cache import RenderCache, make_render_key
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def _load_zstd() -> Optional[Callable[[int], _Compressor]]:
+    try:
+        # Python 3.14+
+        from compression import zstd
+
+        return lambda level: zstd.ZstdCompressor(level=level)
+    except ImportError:
+        pass
+
+    try:
+        # Optional dependency: `pip install py-fastapi[zstd]`
+        import zstandard
+    except ImportError:
+        return None
+
+    return lambda level: zstandard.ZstdCompressor(level=level).compressobj()
+
+
+_zstd_compressor = _load_zstd()
+
+# Statuses that never carry a body worth encoding; 206 bodies are byte ranges of the identity encoding
+_SKIP_STATUSES = frozenset({204, 206, 304})
+
+# Precompressed body caches of every middleware instance; registered once here, since the registry
+# keeps the first callback under a name and a second instance would otherwise go unreported
+_caches: "weakref.WeakSet[RenderCache]" = weakref.WeakSet()
+
+metrics.callback("compression_cache_hits_total", "Precompressed body cache hits", lambda: sum(cache.stats().hits for cache in _caches), type_name="counter")
+metrics.callback("compression_cache_misses_total", "Precompressed body cache misses", lambda: sum(cache.stats().misses for cache in _caches), type_name="counter")
+metrics.callback("compression_cache_bytes", "Bytes held by precompressed body caches", lambda: sum(cache.stats().size_bytes for cache in _caches))
+
+
+# Pick the best supported coding from an Accept-Encoding header
+def negotiate_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """Highest q-value wins; ties go to the earlier entry in `available`. Returns None for identity."""
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        weight = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI response compression (zstd when available, gzip, deflate).
+    Single-message bodies are compressed whole, with results for strong ETags kept in a small cache;
+    streamed bodies are compressed chunk by chunk without buffering the response.
+    HEAD responses get the headers the matching GET would carry, without a body to encode.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        content_types: Sequence[str] = ("text/", "application/json", "image/svg+xml"),
+        cache_max_entries: int = 256,
+        cache_max_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        if minimum_size < 0:
+            raise ValueError("Minimum size must be greater than or equal to 0")
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_type.lower() for content_type in content_types)
+
+        self.compressors: dict[str, Callable[[], _Compressor]] = {}
+        if _zstd_compressor is not None:
+            self.compressors["zstd"] = lambda: _zstd_compressor(zstd_level)
+        self.compressors["gzip"] = lambda: zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        # HTTP "deflate" is the zlib format, not raw deflate
+        self.compressors["deflate"] = lambda: zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS)
+        self.encodings = tuple(self.compressors)
+
+        self.cache: Optional[RenderCache] = None
+        if cache_max_entries and cache_max_bytes:
+            self.cache = RenderCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+            _caches.add(self.cache)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def is_compressible(self, status_code: int, headers: MutableHeaders) -> bool:
+        if status_code < 200 or status_code in _SKIP_STATUSES:
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(self.content_types)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper; holds the start message until the first body chunk decides the path."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: Optional[str], send: Send) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+
+        self.start_message: Optional[Message] = None
+        self.headers: Optional[MutableHeaders] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = MutableHeaders(raw=list(message.get("headers", ())))
+            message["headers"] = headers.raw
+
+            if not self.middleware.is_compressible(message["status"], headers):
+                self.passthrough = True
+            else:
+                # The representation depends on Accept-Encoding even when this client gets identity
+                headers.add_vary_header("Accept-Encoding")
+                self.passthrough = self.encoding is None
+
+            if self.passthrough:
+                await self._send(message)
+            elif self.scope.get("method") == "HEAD":
+                await self._send_head(message, headers)
+            else:
+                self.start_message, self.headers = message, headers
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body:
+                await self._send_complete(body)
+                return
+
+            declared = self.headers.get("content-length")
+            if declared is not None and declared.isdigit() and int(declared) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            # Streamed body: length is unknown up front
+            self.compressor = self.middleware.compressors[self.encoding]()
+            self._mark_encoded()
+            del self.headers["content-length"]
+            await self._send(self.start_message)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_complete(self, body: bytes) -> None:
+        if len(body) < self.middleware.minimum_size:
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        cache = self.middleware.cache
+        cache_key = self._cache_key()
+        compressed = cache.get(cache_key) if cache_key is not None else None
+
+        if compressed is None:
+            compressor = self.middleware.compressors[self.encoding]()
+            compressed = compressor.compress(body) + compressor.flush()
+            if cache_key is not None:
+                cache.set(cache_key, compressed)
+
+        if len(compressed) >= len(body):
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        self._mark_encoded()
+        self.headers["content-length"] = str(len(compressed))
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_head(self, message: Message, headers: MutableHeaders) -> None:
+        """Decide as GET would from the declared length; the encoded length is known only if GET cached it."""
+
+        self.headers = headers
+        self.passthrough = True
+
+        declared = headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) < self.middleware.minimum_size:
+            await self._send(message)
+            return
+
+        cache_key = self._cache_key()
+        compressed = self.middleware.cache.get(cache_key) if cache_key is not None else None
+
+        self._mark_encoded()
+        if compressed is not None:
+            headers["content-length"] = str(len(compressed))
+        else:
+            del headers["content-length"]
+        await self._send(message)
+
+    def _cache_key(self) -> Optional[str]:
+        # Only strong validators promise byte-identical bodies
+        etag = self.headers.get("etag")
+        if self.middleware.cache is None or not etag or etag.startswith("W/"):
+            return None
+        return make_render_key(self.encoding, self.scope.get("path"), self.scope.get("query_string"), etag)
+
+    def _mark_encoded(self) -> None:
+        self.headers["content-encoding"] = self.encoding
+
+        # The encoded body is a different byte sequence; weak comparison still matches If-None-Match
+        etag = self.headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            self.headers["etag"] = f"W/{etag}"
+
+
+__all__ = ["CompressionMiddleware", "negotiate_encoding"]
@@ -1,33 +1,59 @@
 import time
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.app.core.timing import request_timing
+
+
+class ProcessTimeMiddleware:
+    """
+    Pure ASGI middleware adding the elapsed handler time (seconds) as a response header.
+    Headers are injected on `http.response.start`, so body messages pass straight through and
+    streaming responses keep their backpressure. Phases recorded through `src.app.core.timing`
+    are reported in a `Server-Timing` header alongside the total.
+    """
 
-class ProcessTimeMiddleware(BaseHTTPMiddleware):
     def __init__(
-        self, app: ASGIApp, *, header_name: str = "x-process-time", precision: int = 4
+        self,
+        app: ASGIApp,
+        *,
+        header_name: str = "x-process-time",
+        precision: int = 4,
+        server_timing: bool = True,
     ) -> None:
-        super().__init__(app)
-
         if precision < 0:
             raise ValueError("Precision must be greater than 0")
 
+        self.app = app
         self.header_name = header_name
         self.precision = precision
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
         start_time = time.perf_counter()
-        try:
-            response = await call_next(request)
-        finally:
-            process_time = time.perf_counter() - start_time
+        with request_timing() as timing:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    process_time = time.perf_counter() - start_time
+
+                    # Copy the raw list so the response object's own headers stay untouched
+                    message["headers"] = list(message.get("headers", ()))
+                    headers = MutableHeaders(scope=message)
+                    headers.append(self.header_name, format(process_time, f".{self.precision}f"))
+
+                    if self.server_timing:
+                        timing.record("total", process_time * 1000)
+                        headers.append("server-timing", timing.header_value())
+
+                await send(message)
 
-        response.headers[self.header_name] = format(process_time, f".{self.precision}f")
-        return response
+            await self.app(scope, receive, send_with_timing)
 
 
-__all__ = [ProcessTimeMiddleware]
+__all__ = ["ProcessTimeMiddleware"]
@@ -0,0 +1,216 @@
+import hashlib
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.core.metrics import metrics
+from src.app.core.response_cache import CachedResponse, directive_seconds, parse_cache_control, ResponseCache, ResponseCachePolicy, route_policy
+from src.app.services.render_cache import etag_matches
+
+http_response_cache_requests = metrics.counter(
+    "http_response_cache_requests_total",
+    "Requests to cacheable routes by outcome (hit, not_modified, miss, bypass)",
+    ("outcome",),
+)
+
+_CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+_STORABLE_STATUSES = frozenset({200})
+# Requests that ask for something other than the shared representation
+_BYPASS_REQUEST_HEADERS = ("authorization", "range")
+# Hop-by-hop headers and those this cache sets itself
+_UNSTORED_HEADERS = frozenset({b"connection", b"keep-alive", b"transfer-encoding", b"age", b"x-cache", b"surrogate-key"})
+# Headers a 304 must repeat from the full response (RFC 9110 15.4.5)
+_NOT_MODIFIED_HEADERS = frozenset({b"cache-control", b"content-location", b"date", b"etag", b"expires", b"vary"})
+
+
+class ResponseCacheMiddleware:
+    """
+    Pure ASGI cache of complete GET/HEAD responses for routes that opted in with `cache_response`
+    or `cache_router`. Hits are answered before routing, so dependencies and serialization are skipped.
+
+    Only 200 responses are stored, and only when their Cache-Control allows a shared cache to
+    (no no-store/private/no-cache, no Set-Cookie) and a lifetime is known from s-maxage, max-age or the
+    route policy, capped by the policy's max_ttl. Vary selects the variant, If-None-Match against the stored ETag is answered with 304,
+    and requests carrying Authorization or Range, or Cache-Control: no-store, go straight to the app.
+    """
+
+    def __init__(self, app: ASGIApp, *, cache: ResponseCache, max_entry_bytes: int = 1024 * 1024) -> None:
+        self.app = app
+        self.cache = cache
+        self.max_entry_bytes = max_entry_bytes
+
+        # Routes in routing order, read from the application on the first request
+        self._routes: Optional[list[tuple[object, Optional[ResponseCachePolicy]]]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _CACHEABLE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        match = self._match(scope)
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+        policy, path_params = match
+
+        headers = Headers(scope=scope)
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives or any(name in headers for name in _BYPASS_REQUEST_HEADERS):
+            http_response_cache_requests.inc(("bypass",))
+            await self.app(scope, receive, send)
+            return
+
+        url = _cache_url(scope)
+        if "no-cache" not in directives:
+            entry = self.cache.get(url, headers)
+            max_age = directive_seconds(directives, "max-age")
+            if entry is not None and (max_age is None or entry.age <= max_age):
+                await self._serve(scope, headers, entry, send)
+                return
+
+        http_response_cache_requests.inc(("miss",))
+        recorder = _ResponseRecorder(send, self.max_entry_bytes)
+        await self.app(scope, receive, recorder.send)
+
+        if scope["method"] == "GET":
+            self._store(url, headers, policy, path_params, recorder)
+
+    def _match(self, scope: Scope) -> Optional[tuple[ResponseCachePolicy, dict]]:
+        if self._routes is None:
+            app = scope.get("app")
+            router = getattr(app, "router", None)
+            if router is None:
+                return None
+            self._routes = [(route, route_policy(route)) for route in router.routes]
+
+        if not any(policy is not None for _, policy in self._routes):
+            return None
+
+        # The first full match is the route the router would pick
+        for route, policy in self._routes:
+            matched, child_scope = route.matches(scope)
+            if matched == Match.FULL:
+                return (policy, child_scope.get("path_params", {})) if policy is not None else None
+        return None
+
+    async def _serve(self, scope: Scope, headers: Headers, entry: CachedResponse, send: Send) -> None:
+        age = str(int(entry.age)).encode("latin-1")
+
+        if entry.etag is not None and etag_matches(headers.get("if-none-match"), entry.etag):
+            http_response_cache_requests.inc(("not_modified",))
+            raw = [(name, value) for name, value in entry.headers if name in _NOT_MODIFIED_HEADERS]
+            raw += [(b"age", age), (b"x-cache", b"HIT")]
+            await send({"type": "http.response.start", "status": 304, "headers": raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        http_response_cache_requests.inc(("hit",))
+        raw = [*entry.headers, (b"age", age), (b"x-cache", b"HIT")]
+        await send({"type": "http.response.start", "status": entry.status, "headers": raw})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else entry.body})
+
+    def _store(self, url: str, request_headers: Headers, policy: ResponseCachePolicy, path_params: dict, recorder: "_ResponseRecorder") -> None:
+        if recorder.status not in _STORABLE_STATUSES or recorder.body is None or recorder.headers is None:
+            return
+
+        response_headers = recorder.headers
+        directives = parse_cache_control(response_headers.get("cache-control"))
+        if any(name in directives for name in ("no-store", "private", "no-cache")) or "set-cookie" in response_headers:
+            return
+
+        ttl = directive_seconds(directives, "s-maxage")
+        if ttl is None:
+            ttl = directive_seconds(directives, "max-age")
+        if ttl is None:
+            ttl = policy.ttl
+        if policy.max_ttl is not None and ttl is not None:
+            ttl = min(ttl, policy.max_ttl)
+        if not ttl:
+            return
+
+        vary = [name.strip() for value in response_headers.getlist("vary") for name in value.split(",") if name.strip()]
+        if "*" in vary:
+            return
+
+        raw_headers = [(name, value) for name, value in response_headers.raw if name not in _UNSTORED_HEADERS]
+        etag = response_headers.get("etag")
+        if etag is None:
+            # Identity bodies are byte-exact, so a content hash is a valid strong validator
+            etag = '"' + hashlib.blake2b(recorder.body, digest_size=16).hexdigest() + '"'
+            raw_headers.append((b"etag", etag.encode("latin-1")))
+
+        surrogate_keys = {template.format(**path_params) for template in policy.surrogate_keys}
+        surrogate_keys.update(recorder.surrogate_keys)
+
+        now = time.monotonic()
+        entry = CachedResponse(
+            status=recorder.status,
+            headers=raw_headers,
+            body=recorder.body,
+            etag=etag,
+            stored_at=now,
+            expires_at=now + ttl,
+            surrogate_keys=frozenset(surrogate_keys),
+        )
+        self.cache.put(url, [*vary, *policy.vary], request_headers, entry)
+
+
+class _ResponseRecorder:
+    """Passes the response through unchanged apart from Surrogate-Key, keeping a copy up to a size limit."""
+
+    def __init__(self, send: Send, max_bytes: int) -> None:
+        self._send = send
+        self.max_bytes = max_bytes
+
+        self.status: Optional[int] = None
+        self.headers: Optional[MutableHeaders] = None
+        self.surrogate_keys: list[str] = []
+        self._chunks: list[bytes] = []
+        self._size = 0
+        self._complete = False
+        self._overflow = False
+
+    @property
+    def body(self) -> Optional[bytes]:
+        if not self._complete or self._overflow:
+            return None
+        return b"".join(self._chunks)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=list(message.get("headers", ())))
+            # Surrogate keys are for this cache only
+            for value in headers.getlist("surrogate-key"):
+                self.surrogate_keys.extend(value.split())
+            del headers["surrogate-key"]
+
+            message["headers"] = headers.raw
+            self.status = message["status"]
+            self.headers = headers
+
+        elif message["type"] == "http.response.body" and not self._overflow:
+            body = message.get("body", b"")
+            self._size += len(body)
+            if self._size > self.max_bytes:
+                self._overflow = True
+                self._chunks = []
+            else:
+                self._chunks.append(body)
+            self._complete = not message.get("more_body", False)
+
+        await self._send(message)
+
+
+# Cache key for a request: path plus query parameters in a canonical order
+def _cache_url(scope: Scope) -> str:
+    query = scope.get("query_string", b"").decode("latin-1")
+    if not query:
+        return scope["path"]
+    return scope["path"] + "?" + urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+__all__ = ["ResponseCacheMiddleware"]
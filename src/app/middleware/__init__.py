@@ -1,3 +1,6 @@
+from .AdmissionControlMiddleware import AdmissionControlMiddleware
+from .CompressionMiddleware import CompressionMiddleware
 from .ProcessTimeMiddleware import ProcessTimeMiddleware
+from .ResponseCacheMiddleware import ResponseCacheMiddleware
 
-__all__ = ["ProcessTimeMiddleware"]
+__all__ = ["AdmissionControlMiddleware", "CompressionMiddleware", "ProcessTimeMiddleware", "ResponseCacheMiddleware"]
@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 from enum import StrEnum
-from sqlalchemy import DateTime, Enum, String, Text, func
+from sqlalchemy import DateTime, Enum, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID as AlUUID
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import Optional
@@ -18,6 +18,11 @@ class UserStatus(StrEnum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pages walk live users in id order; the partial index skips soft-deleted rows.
+        # Covering updated_at makes the If-None-Match version probe an index-only scan.
+        Index("ix_users_live_id", "id", postgresql_where=text("deleted_at IS NULL"), postgresql_include=["updated_at"]),
+    )
 
     tenant_id: Mapped[PyUUID] = mapped_column(
         AlUUID(as_uuid=True),
@@ -0,0 +1,3 @@
+from .user_repository import decode_cursor, encode_cursor, InvalidCursorError, parse_user_etags, user_etag, UserRepository
+
+__all__ = ["decode_cursor", "encode_cursor", "InvalidCursorError", "parse_user_etags", "user_etag", "UserRepository"]
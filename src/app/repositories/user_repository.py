@@ -0,0 +1,153 @@
+import base64
+import binascii
+import re
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.user import User, UserStatus
+
+# Columns served by the API; selected explicitly so list queries skip ORM identity-map overhead
+USER_COLUMNS: tuple[ColumnElement, ...] = (
+    User.id,
+    User.tenant_id,
+    User.email,
+    User.email_verified,
+    User.email_verified_at,
+    User.phone,
+    User.phone_verified_at,
+    User.status,
+    User.locked_until,
+    User.last_login_at,
+    User.created_at,
+    User.updated_at,
+    User.deleted_at,
+)
+
+# Versioned so the cursor format can change without misreading old cursors
+_CURSOR_VERSION = b"\x01"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+_USER_ETAG = re.compile(r'(?:W/)?"([0-9a-f]{32})\.([0-9a-f]+)"')
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+# Opaque pagination cursor for the last id of a page
+def encode_cursor(last_id: UUID) -> str:
+    return base64.urlsafe_b64encode(_CURSOR_VERSION + last_id.bytes).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> UUID:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError("Malformed cursor") from None
+    if len(raw) != 17 or raw[:1] != _CURSOR_VERSION:
+        raise InvalidCursorError("Malformed cursor")
+    return UUID(bytes=raw[1:])
+
+
+# Weak entity tag for a user version; updated_at changes on every write
+def user_etag(id: UUID, updated_at: datetime) -> str:
+    """Encodes id and updated_at (whole microseconds) so If-Match can be turned back into a version."""
+
+    return f'W/"{id.hex}.{(updated_at - _EPOCH) // _MICROSECOND:x}"'
+
+
+def parse_user_etags(header: str, id: UUID) -> list[datetime]:
+    """updated_at values named by the entity tags in an If-Match header for this user; others are ignored."""
+
+    versions = []
+    for match in _USER_ETAG.finditer(header):
+        if match.group(1) == id.hex:
+            versions.append(_EPOCH + int(match.group(2), 16) * _MICROSECOND)
+    return versions
+
+
+class UserRepository:
+    """Data access for users; soft-deleted rows (deleted_at set) are hidden unless asked for."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get(self, id: UUID, include_deleted: bool = False) -> Optional[Mapping[str, Any]]:
+        statement = select(*USER_COLUMNS).where(User.id == id)
+        if not include_deleted:
+            statement = statement.where(User.deleted_at.is_(None))
+
+        result = await self.session.execute(statement)
+        return result.mappings().one_or_none()
+
+    async def get_version(self, id: UUID) -> Optional[datetime]:
+        """updated_at of a live user; an index-only scan of ix_users_live_id."""
+
+        result = await self.session.execute(select(User.updated_at).where(User.id == id, User.deleted_at.is_(None)))
+        return result.scalar_one_or_none()
+
+    async def get_by_email(self, email: str) -> Optional[Mapping[str, Any]]:
+        statement = select(*USER_COLUMNS).where(User.email == email, User.deleted_at.is_(None))
+        result = await self.session.execute(statement)
+        return result.mappings().one_or_none()
+
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[UUID] = None,
+        columns: Sequence[ColumnElement] = USER_COLUMNS,
+    ) -> tuple[list[Mapping[str, Any]], bool]:
+        """
+        Keyset page ordered by id. UUIDv7 ids are time-ordered, so this is creation order and
+        each page is an index range scan starting after the cursor, however deep the page.
+        Returns the rows and whether more follow (one extra row is fetched to tell).
+        """
+
+        statement = select(*columns).where(User.deleted_at.is_(None)).order_by(User.id).limit(limit + 1)
+        if after is not None:
+            statement = statement.where(User.id > after)
+
+        result = await self.session.execute(statement)
+        rows = list(result.mappings().fetchmany(limit + 1))
+        return rows[:limit], len(rows) > limit
+
+    async def patch(self, id: UUID, changes: Mapping[str, Any], versions: Optional[Sequence[datetime]] = None) -> Optional[Mapping[str, Any]]:
+        """
+        Apply a partial update in one round trip; None when the user does not exist.
+        With `versions`, only a row whose updated_at is one of them is updated (optimistic concurrency),
+        so a concurrent edit makes this return None instead of being overwritten.
+        """
+
+        if not changes:
+            row = await self.get(id)
+            return row if row is not None and (versions is None or row["updated_at"] in versions) else None
+
+        statement = update(User).where(*self._live(id, versions)).values(**changes).returning(*USER_COLUMNS)
+        result = await self.session.execute(statement)
+        return result.mappings().one_or_none()
+
+    async def soft_delete(self, id: UUID, versions: Optional[Sequence[datetime]] = None) -> Optional[Mapping[str, Any]]:
+        statement = (
+            update(User)
+            .where(*self._live(id, versions))
+            .values(deleted_at=func.now(), status=UserStatus.DISABLED)
+            .returning(*USER_COLUMNS)
+        )
+        result = await self.session.execute(statement)
+        return result.mappings().one_or_none()
+
+    @staticmethod
+    def _live(id: UUID, versions: Optional[Sequence[datetime]]) -> list[ColumnElement[bool]]:
+        criteria = [User.id == id, User.deleted_at.is_(None)]
+        if versions is not None:
+            criteria.append(User.updated_at.in_(versions))
+        return criteria
+
+
+__all__ = ["decode_cursor", "encode_cursor", "InvalidCursorError", "parse_user_etags", "USER_COLUMNS", "user_etag", "UserRepository"]
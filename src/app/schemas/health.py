@@ -0,0 +1,24 @@
+from typing import Optional
+
+from .base_schema import BaseSchema
+
+
+class DatabaseHealthSchema(BaseSchema):
+    healthy: bool
+    checked_seconds_ago: Optional[float] = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PoolUsageSchema(BaseSchema):
+    size: int
+    checked_out: int
+    overflow: int
+    capacity: Optional[int] = None
+    saturation: Optional[float] = None
+
+
+class ReadinessSchema(BaseSchema):
+    ready: bool
+    database: DatabaseHealthSchema
+    pool: PoolUsageSchema
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import Field, field_validator
+
+from ..models.user import UserStatus
+from .base_schema import BaseSchema
+
+
+class User(BaseSchema):
+    id: UUID
+    tenant_id: Optional[UUID] = None
+
+    email: str
+    email_verified: bool = False
+    email_verified_at: Optional[datetime] = None
+
+    phone: Optional[str] = None
+    phone_verified_at: Optional[datetime] = None
+
+    status: UserStatus
+    locked_until: Optional[datetime] = None
+    last_login_at: Optional[datetime] = None
+
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: Optional[datetime] = None
+
+
+class UserUpdate(BaseSchema):
+    email: Optional[str] = Field(default=None, max_length=255)
+    email_verified: Optional[bool] = None
+    phone: Optional[str] = None
+    status: Optional[UserStatus] = None
+    locked_until: Optional[datetime] = None
+
+    @field_validator("email", "email_verified", "status")
+    @classmethod
+    def _not_null(cls, value):
+        # Omit a field to leave it unchanged; these columns cannot be cleared
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+
+
+class UserImportRow(BaseSchema):
+    email: str = Field(min_length=3, max_length=255, pattern=r"^[^@\s]+@[^@\s]+$")
+    tenant_id: Optional[UUID] = None
+    email_verified: bool = False
+    phone: Optional[str] = Field(default=None, max_length=64)
+    status: UserStatus = UserStatus.PENDING_VERIFICATION
+
+    @field_validator("email")
+    @classmethod
+    def _strip_email(cls, value: str) -> str:
+        return value.strip()
+
+    @field_validator("email", "phone")
+    @classmethod
+    def _no_nul(cls, value: Optional[str]) -> Optional[str]:
+        # Postgres text cannot hold NUL; the whole chunk would be rejected by COPY
+        if value is not None and "\x00" in value:
+            raise ValueError("Must not contain NUL characters")
+        return value
+
+
+class UserImportError(BaseSchema):
+    row: int
+    errors: list[dict]
+
+
+class UserImportSummary(BaseSchema):
+    received: int
+    inserted: int
+    updated: int
+    restored: int = Field(description="Soft-deleted users brought back by the import; included in updated")
+    duplicates: int
+    failed: int
+    errors: list[UserImportError] = Field(description="First failing rows, capped by USER_IMPORT_MAX_ERRORS")
+
+
+class UserPage(BaseSchema):
+    items: list[User]
+    next_cursor: Optional[str] = Field(default=None, description="Opaque cursor for the following page")
+    has_more: bool
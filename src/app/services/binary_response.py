@@ -0,0 +1,114 @@
+from collections.abc import Mapping
+
+from fastapi import Response, status
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from .render_cache import etag_matches
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+# Resolve a single "bytes=" range against a payload size
+def parse_byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Return an inclusive (start, end) pair, or None when the header should be ignored
+    (unknown unit, multiple ranges, malformed). Raises RangeNotSatisfiable when out of bounds.
+    """
+
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, separator, last = ranges.strip().partition("-")
+    if not separator:
+        return None
+
+    try:
+        if not first:
+            # Suffix range: the final N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class BinaryResponse(Response):
+    """
+    Fully-materialized binary payload sent as a single body message.
+    The payload is wrapped in a memoryview so neither full nor partial (Range) bodies are copied,
+    Content-Length is always exact, and HEAD requests get headers only.
+    """
+
+    def __init__(
+        self,
+        content: bytes | bytearray | memoryview,
+        status_code: int = status.HTTP_200_OK,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(content, status_code, headers, media_type, background)
+        self.headers.setdefault("accept-ranges", "bytes")
+
+    def render(self, content: bytes | bytearray | memoryview) -> memoryview:
+        return memoryview(content).cast("B")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        send_body = scope.get("method") != "HEAD"
+
+        status_code = self.status_code
+        headers = self.headers
+        body: memoryview = self.body
+        size = len(body)
+
+        range_header = request_headers.get("range")
+        if range_header and status_code == status.HTTP_200_OK and self._range_applies(request_headers):
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except RangeNotSatisfiable:
+                headers = self._partial_headers(content_range=f"bytes */{size}", content_length=0)
+                status_code, body = status.HTTP_416_RANGE_NOT_SATISFIABLE, body[:0]
+            else:
+                if byte_range is not None:
+                    start, end = byte_range
+                    headers = self._partial_headers(content_range=f"bytes {start}-{end}/{size}", content_length=end - start + 1)
+                    status_code, body = status.HTTP_206_PARTIAL_CONTENT, body[start : end + 1]
+
+        await send({"type": "http.response.start", "status": status_code, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body if send_body else b""})
+
+        if self.background is not None:
+            await self.background()
+
+    def _range_applies(self, request_headers: Headers) -> bool:
+        # If-Range: only honor the range when the client's validator still matches
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        etag = self.headers.get("etag")
+        return etag is not None and not if_range.startswith("W/") and etag_matches(if_range, etag)
+
+    def _partial_headers(self, content_range: str, content_length: int):
+        headers = self.headers.mutablecopy()
+        headers["content-range"] = content_range
+        headers["content-length"] = str(content_length)
+        return headers
+
+
+__all__ = ["BinaryResponse", "RangeNotSatisfiable", "parse_byte_range"]
@@ -1,69 +1,340 @@
+import base64
 import io
 import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import cached_property, lru_cache
 
+import numpy as np
 import qrcode
-from PIL import Image
+from PIL import Image, ImageColor
+
+from ..core.config import settings
+
+# Rasterized QR codes use palette index 0 for background and 1 for fill; watermark colors follow
+_QR_PALETTE_SIZE = 2
+_WATERMARK_MAX_COLORS = 256 - _QR_PALETTE_SIZE
+
+
+class QRFormat(StrEnum):
+    PNG = "png"
+    SVG = "svg"
+    WEBP = "webp"
+
+    @property
+    def media_type(self) -> str:
+        return _QR_MEDIA_TYPES[self]
+
+
+_QR_MEDIA_TYPES: dict[QRFormat, str] = {
+    QRFormat.PNG: "image/png",
+    QRFormat.SVG: "image/svg+xml",
+    QRFormat.WEBP: "image/webp",
+}
+
+
+@dataclass(frozen=True)
+class SizedWatermark:
+    image: Image.Image
+    mask: Image.Image
+    background: Image.Image
+    # Watermark flattened over its background and quantized to a palette
+    composite: Image.Image
+    # Composite as palette indices offset past the QR colors
+    indices: np.ndarray
+    palette: list[int]
+
+    @cached_property
+    def data_uri(self) -> str:
+        """Composite as a PNG data URI; encoded lazily since only vector output embeds it."""
+
+        buffer = io.BytesIO()
+        self.composite.save(buffer, format="png", optimize=True)
+        return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class WatermarkCache:
+    """Decoded watermark sources plus their resized variants, memoized per target size."""
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries < 1:
+            raise ValueError("Max entries must be greater than 0")
+
+        self.max_entries = max_entries
+
+        # path -> (mtime, decoded RGBA source)
+        self._sources: dict[str, tuple[float, Image.Image]] = {}
+        # (path, mtime, size, background color) -> resized watermark
+        self._sized: OrderedDict[tuple[str, float, tuple[int, int], str], SizedWatermark] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def preload(self, path: str) -> None:
+        self._load_source(path)
+
+    def _load_source(self, path: str) -> tuple[float, Image.Image]:
+        mtime = os.stat(path).st_mtime
+        cached = self._sources.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached
+
+        # Changed or unseen file; drop stale sizes for this path
+        with Image.open(path) as source:
+            decoded = source.convert("RGBA")
+        with self._lock:
+            self._sources[path] = (mtime, decoded)
+            for key in [key for key in self._sized if key[0] == path and key[1] != mtime]:
+                del self._sized[key]
+        return mtime, decoded
+
+    def get(self, path: str, size: tuple[int, int], background_color: str) -> SizedWatermark:
+        mtime, source = self._load_source(path)
+        key = (path, mtime, size, background_color)
+
+        with self._lock:
+            cached = self._sized.get(key)
+            if cached is not None:
+                self._sized.move_to_end(key)
+                return cached
+
+        image = source.resize(size, Image.Resampling.LANCZOS)
+        background = Image.new("RGBA", size, background_color)
+
+        # Flatten once and quantize so it can be pasted into a palette image as plain indices
+        composite = Image.alpha_composite(background, image).convert("RGB").quantize(colors=_WATERMARK_MAX_COLORS)
+        composite_palette = composite.getpalette() or []
+        color_count = min(_WATERMARK_MAX_COLORS, len(composite_palette) // 3)
+
+        sized = SizedWatermark(
+            image=image,
+            mask=image.split()[3],
+            background=background,
+            composite=composite,
+            indices=np.asarray(composite, dtype=np.uint8) + _QR_PALETTE_SIZE,
+            palette=composite_palette[: color_count * 3],
+        )
+
+        with self._lock:
+            self._sized[key] = sized
+            while len(self._sized) > self.max_entries:
+                self._sized.popitem(last=False)
+        return sized
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sources.clear()
+            self._sized.clear()
+
+
+watermark_cache = WatermarkCache(max_entries=settings.qr_watermark_cache_size)
+
+
+# Decode the watermark ahead of the first request; also used as a process pool initializer
+def preload_watermark(path: str) -> None:
+    watermark_cache.preload(path)
+
+
+# Identifies the watermark file's current content for cache keys and validators; None when it cannot be read
+def watermark_version(path: str | None) -> tuple[int, int] | None:
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Parse a CSS-style color, raising ValueError for anything Pillow does not understand
+def parse_color(color: str) -> tuple[int, int, int, int]:
+    return ImageColor.getcolor(color, "RGBA")
+
+
+###########################################
+# Stage one: encoding
+###########################################
+@lru_cache(maxsize=settings.qr_matrix_cache_size)
+def encode_matrix(data: str, error_correction: int = qrcode.constants.ERROR_CORRECT_H) -> np.ndarray:
+    """
+    Encode data into a read-only boolean module matrix (True = dark module), without border.
+    Reed-Solomon encoding and mask selection are the expensive part, so results are memoized.
+    """
+
+    qr = qrcode.QRCode(version=1, error_correction=error_correction, border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    matrix = np.array(qr.get_matrix(), dtype=bool)
+    matrix.flags.writeable = False
+    return matrix
+
+
+###########################################
+# Stage two: styling
+###########################################
+def rasterize(matrix: np.ndarray, box_size: int, border: int) -> np.ndarray:
+    """Scale a module matrix to pixels of palette indices (0 = background, 1 = fill)."""
+
+    padded = np.pad(matrix, border, constant_values=False)
+    return np.repeat(np.repeat(padded, box_size, axis=0), box_size, axis=1).astype(np.uint8)
+
+
+def to_palette_image(pixels: np.ndarray, palette: list[int], alphas: bytes | None = None) -> Image.Image:
+    """Wrap palette indices in a "P" image; `alphas` holds per-index transparency when needed."""
+
+    image = Image.fromarray(pixels)
+    image.putpalette(palette)
+    if alphas is not None:
+        image.info["transparency"] = alphas
+    return image
+
+
+def _svg_color(rgba: tuple[int, int, int, int]) -> str:
+    color = f'"#{rgba[0]:02x}{rgba[1]:02x}{rgba[2]:02x}"'
+    if rgba[3] < 255:
+        color += f' fill-opacity="{rgba[3] / 255:.3g}"'
+    return color
 
 
 class QRService:
     # Initialize QR code with specified size and output format
     def __init__(
-        self, background_color: str = "#ffffff", fill_color="#000000", size: int = 10
+        self,
+        background_color: str = "#ffffff",
+        fill_color="#000000",
+        size: int = 10,
+        error_correction: int = qrcode.constants.ERROR_CORRECT_H,
     ) -> None:
-        # Placeholders
         self.background_color = background_color
         self.fill_color = fill_color
+        self.error_correction = error_correction
 
         # Configure QR code parameters
-        self.qr: qrcode.QRCode = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=size,
-            border=math.ceil(size / 5),
-        )
+        self.box_size = size
+        self.border = math.ceil(size / 5)
+
+        self.background_rgba = parse_color(background_color)
+        self.fill_rgba = parse_color(fill_color)
+        self.palette: list[int] = [*self.background_rgba[:3], *self.fill_rgba[:3]]
+        self.alphas: bytes | None = None
+        if self.background_rgba[3] < 255 or self.fill_rgba[3] < 255:
+            self.alphas = bytes((self.background_rgba[3], self.fill_rgba[3]))
+
+        self.watermark: SizedWatermark | None = None
+        self._qr_image: Image.Image | None = None
+
+    @property
+    def pixel_size(self) -> int:
+        return (self.matrix.shape[0] + 2 * self.border) * self.box_size
 
     # Generate QR code from URL
     def generate(self, data: str):
-        # Add data to QR code
-        self.qr.add_data(data)
-        self.qr.make(fit=True)
-
-        # Create QR code image
-        self.qr_image = self.qr.make_image(
-            back_color=self.background_color, fill_color=self.fill_color
-        ).convert("RGBA")
+        # Encoding is cached per (data, error level); styling happens on output
+        self.matrix = encode_matrix(data, self.error_correction)
+        self.watermark = None
+        self._qr_image = None
 
     def add_watermark(self, logo_path: str):
-        # Load and resize watermark image
-        watermark: Image.Image = Image.open(logo_path).convert("RGBA")
-        watermark_size: tuple[int, int] = (
-            self.qr_image.size[0] // 4,
-            self.qr_image.size[1] // 4,
-        )
-        watermark = watermark.resize(watermark_size, Image.Resampling.LANCZOS)
-        watermark_mask: Image.Image = watermark.split()[3]
+        # Resized watermark, mask and background tile are memoized per QR size
+        watermark_size = self.pixel_size // 4
+        self.watermark = watermark_cache.get(logo_path, (watermark_size, watermark_size), self.background_color)
+        self._qr_image = None
+
+    @property
+    def qr_image(self) -> Image.Image:
+        """Rasterized "P" image, built on first access."""
+
+        if self._qr_image is None:
+            pixels = rasterize(self.matrix, self.box_size, self.border)
+            palette = self.palette
+
+            if self.watermark is not None:
+                # Overwrite the center with the pre-flattened watermark indices and extend the palette
+                height, width = self.watermark.indices.shape
+                left = (pixels.shape[1] - width) // 2
+                top = (pixels.shape[0] - height) // 2
+                pixels[top : top + height, left : left + width] = self.watermark.indices
+                palette = palette + self.watermark.palette
 
-        # Calculate position to center the watermark
-        position: tuple[int, int] = (
-            (self.qr_image.size[0] - watermark.size[0]) // 2,
-            (self.qr_image.size[1] - watermark.size[1]) // 2,
+            self._qr_image = to_palette_image(pixels, palette, self.alphas)
+
+        return self._qr_image
+
+    def to_svg(self) -> bytes:
+        """Vector output straight from the module matrix, one merged path for all dark modules."""
+
+        modules = self.matrix.shape[0] + 2 * self.border
+
+        # Horizontal runs of dark modules: +1 marks a run start, -1 the column after its end
+        edges = np.diff(np.pad(self.matrix, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+        starts = np.argwhere(edges == 1)
+        ends = np.argwhere(edges == -1)[:, 1]
+        offset = self.border
+        path = "".join(
+            f"M{column + offset} {row + offset}h{end - column}v1h-{end - column}z"
+            for (row, column), end in zip(starts.tolist(), ends.tolist())
         )
 
-        # Add white background for the watermark
-        background = Image.new("RGBA", watermark.size, self.background_color)
-        self.qr_image.paste(background, position, background)
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.pixel_size}" height="{self.pixel_size}" viewBox="0 0 {modules} {modules}" shape-rendering="crispEdges">',
+            f'<rect width="{modules}" height="{modules}" fill={_svg_color(self.background_rgba)}/>',
+            f'<path d="{path}" fill={_svg_color(self.fill_rgba)}/>',
+        ]
 
-        # Paste watermark onto QR code image
-        self.qr_image.paste(watermark, position, watermark_mask)
+        if self.watermark is not None:
+            # Same box as the raster output, expressed in module units
+            extent = self.watermark.indices.shape[1] / self.box_size
+            origin = (modules - extent) / 2
+            parts.append(
+                f'<image x="{origin:.4g}" y="{origin:.4g}" width="{extent:.4g}" height="{extent:.4g}" '
+                f'preserveAspectRatio="none" href="{self.watermark.data_uri}"/>'
+            )
 
-    def to_buffer_stream(self) -> io.BytesIO:
+        parts.append("</svg>")
+        return "".join(parts).encode("utf-8")
+
+    def to_bytes(self, format: QRFormat = QRFormat.PNG) -> bytes:
+        if format == QRFormat.SVG:
+            return self.to_svg()
+        return self.to_buffer_stream(format).getvalue()
+
+    def to_buffer_stream(self, format: QRFormat = QRFormat.PNG) -> io.BytesIO:
         # Create an in-memory bytes buffer
         buffer: io.BytesIO = io.BytesIO()
 
         # Save QR code image to the buffer
-        self.qr_image.save(buffer, format="png")
+        if format == QRFormat.SVG:
+            buffer.write(self.to_svg())
+        elif format == QRFormat.WEBP:
+            self.qr_image.save(buffer, format="webp", lossless=True, method=settings.qr_webp_method)
+        else:
+            # Two-color codes are written as 1-bit PNGs, watermarked ones as 8-bit palette
+            self.qr_image.save(
+                buffer,
+                format="png",
+                compress_level=settings.qr_png_compress_level,
+                optimize=settings.qr_png_optimize,
+            )
 
         # Reset buffer's cursor to the beginning
         buffer.seek(0)
 
         return buffer
+
+
+# Render a QR code; module level so process pools can pickle it
+def render_qr(
+    data: str,
+    watermark_path: str | None = None,
+    background_color: str = "#ffffff",
+    fill_color: str = "#000000",
+    size: int = 10,
+    format: QRFormat = QRFormat.PNG,
+) -> bytes:
+    qr_service = QRService(background_color=background_color, fill_color=fill_color, size=size)
+    qr_service.generate(data=data)
+    if watermark_path:
+        qr_service.add_watermark(watermark_path)
+    return qr_service.to_bytes(format)
@@ -0,0 +1,224 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any, Optional
+from uuid import UUID
+
+from ..core.cache import cache_backend, CacheBackend
+from ..core.config import CacheBackendKind, settings
+from ..core.logger import get_logger
+from ..core.metrics import metrics
+from ..core.singleflight import SingleFlight
+from ..schemas.user import User
+
+_logger = get_logger(__name__)
+
+# Shared-backend marker for "known not to exist"
+_NEGATIVE = b""
+# Local marker for "known not to exist"
+_MISSING = object()
+
+user_cache_requests = metrics.counter(
+    "user_cache_requests_total",
+    "User cache lookups by outcome (local, shared, negative, miss)",
+    ("key", "outcome"),
+)
+
+Loader = Callable[[], Awaitable[Optional[Mapping[str, Any]]]]
+
+
+class _LocalLRU:
+    """Per-worker LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class UserCache:
+    """
+    Read-through cache for user lookups: per-worker LRU, then an optional shared backend, then the loader.
+    Entries by id hold the user; entries by email hold only the id, so invalidating the id is enough.
+    Misses are cached for a shorter TTL, and concurrent misses for one key share a single load.
+    The local TTL bounds how long other workers may serve a user this worker has invalidated.
+    Loaders must read from the primary; a replica lagging behind an invalidated write would store the old row for the full TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        local_ttl: float,
+        negative_ttl: float,
+        shared: Optional[CacheBackend] = None,
+        key_prefix: str = "",
+    ) -> None:
+        self.ttl = ttl
+        self.local_ttl = min(local_ttl, ttl)
+        self.negative_ttl = negative_ttl
+        self.shared = shared
+        self.key_prefix = f"{key_prefix}:" if key_prefix else ""
+
+        self._local = _LocalLRU(max_entries)
+        self._flight: SingleFlight[Any] = SingleFlight()
+        # Bumped on every invalidation; a load only stores its result if no write happened while it ran
+        self._generation = 0
+
+    def id_key(self, id: UUID) -> str:
+        return f"{self.key_prefix}user:id:{id}"
+
+    def email_key(self, email: str) -> str:
+        return f"{self.key_prefix}user:email:{email.strip().lower()}"
+
+    async def get_by_id(self, id: UUID, loader: Loader) -> Optional[User]:
+        key = self.id_key(id)
+        cached = await self._cached_user(key, "id")
+        if cached is not None:
+            return None if cached is _MISSING else cached
+
+        result, _ = await self._flight.do(key, lambda: self._load_user(key, loader))
+        return result
+
+    async def get_by_email(self, email: str, loader: Loader) -> Optional[User]:
+        """`loader` looks the user up by email."""
+
+        key = self.email_key(email)
+        cached = await self._lookup(key, "email")
+        if cached is _MISSING:
+            return None
+        if cached is not None:
+            user_id = UUID(cached.decode("ascii")) if isinstance(cached, bytes) else cached
+            user = await self._cached_user(self.id_key(user_id), "id")
+            # The pointer outlives an email change; only trust it while the user still has this email
+            if isinstance(user, User) and user.email.strip().lower() == email.strip().lower():
+                return user
+
+        result, _ = await self._flight.do(key, lambda: self._load_email(key, loader))
+        return result
+
+    async def invalidate(self, id: UUID, *emails: str) -> None:
+        """Drop a user (and optionally email entries) from both layers; call after the write commits."""
+
+        keys = [self.id_key(id), *(self.email_key(email) for email in emails)]
+        self._generation += 1
+        await self._delete(*keys)
+
+    async def invalidate_many(self, users: Iterable[tuple[UUID, str]]) -> None:
+        """invalidate() for many (id, email) pairs with a single backend round trip."""
+
+        keys = [key for id, email in users for key in (self.id_key(id), self.email_key(email))]
+        if keys:
+            self._generation += 1
+            await self._delete(*keys)
+
+    async def _cached_user(self, key: str, kind: str) -> Any:
+        cached = await self._lookup(key, kind)
+        if isinstance(cached, bytes):
+            user = User.model_validate_json(cached)
+            self._local.set(key, user, self.local_ttl)
+            return user
+        return cached
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+    async def _lookup(self, key: str, kind: str) -> Any:
+        value = self._local.get(key)
+        if value is not None:
+            user_cache_requests.inc((kind, "negative" if value is _MISSING else "local"))
+            return value
+
+        if self.shared is not None:
+            try:
+                raw = await self.shared.get(key)
+            except Exception as ex:
+                _logger.warning("Shared user cache read failed: %s", ex)
+                raw = None
+            if raw is not None:
+                value = _MISSING if raw == _NEGATIVE else raw
+                self._local.set(key, value, self.negative_ttl if value is _MISSING else self.local_ttl)
+                user_cache_requests.inc((kind, "negative" if value is _MISSING else "shared"))
+                return value
+
+        user_cache_requests.inc((kind, "miss"))
+        return None
+
+    async def _load_user(self, key: str, loader: Loader) -> Optional[User]:
+        generation = self._generation
+        row = await loader()
+        if row is None:
+            await self._store(key, generation, _MISSING, _NEGATIVE, self.negative_ttl)
+            return None
+
+        user = User.model_validate(row)
+        await self._store(key, generation, user, user.model_dump_json().encode("utf-8"), self.ttl)
+        return user
+
+    async def _load_email(self, key: str, loader: Loader) -> Optional[User]:
+        generation = self._generation
+        row = await loader()
+        if row is None:
+            await self._store(key, generation, _MISSING, _NEGATIVE, self.negative_ttl)
+            return None
+
+        user = User.model_validate(row)
+        await self._store(self.id_key(user.id), generation, user, user.model_dump_json().encode("utf-8"), self.ttl)
+        await self._store(key, generation, user.id, str(user.id).encode("ascii"), self.ttl)
+        return user
+
+    async def _store(self, key: str, generation: int, local_value: Any, shared_value: bytes, ttl: float) -> None:
+        if self._generation != generation:
+            return
+
+        self._local.set(key, local_value, min(ttl, self.local_ttl))
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, shared_value, ttl)
+            except Exception as ex:
+                _logger.warning("Shared user cache write failed: %s", ex)
+
+    async def _delete(self, *keys: str) -> None:
+        self._local.delete(*keys)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(*keys)
+            except Exception as ex:
+                # Other workers' local copies still expire after local_ttl; shared ones after ttl
+                _logger.warning("Shared user cache delete failed: %s", ex)
+
+
+user_cache = UserCache(
+    max_entries=settings.user_cache_max_entries,
+    ttl=settings.user_cache_ttl,
+    local_ttl=settings.user_cache_local_ttl,
+    negative_ttl=settings.user_cache_negative_ttl,
+    # The memory backend would only duplicate the per-worker layer
+    shared=cache_backend if settings.cache_backend != CacheBackendKind.MEMORY else None,
+    key_prefix=settings.cache_key_prefix,
+)
+
+
+__all__ = ["UserCache", "user_cache"]
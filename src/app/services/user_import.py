@@ -0,0 +1,273 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Optional
+from uuid import UUID, uuid7
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..schemas.user import UserImportRow
+from .user_cache import user_cache
+
+_logger = get_logger(__name__)
+
+_STAGING_TABLE = "user_import_staging"
+_STAGING_COLUMNS = ("row_number", "id", "tenant_id", "email", "email_verified", "phone", "status")
+
+
+class ImportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+@dataclass
+class UserImportResult:
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    # Soft-deleted users brought back by the import; also counted in `updated`
+    restored: int = 0
+    # Earlier rows superseded by a later row with the same email in the same chunk
+    duplicates: int = 0
+    failed: int = 0
+    # Capped at USER_IMPORT_MAX_ERRORS so memory does not grow with bad input
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, errors: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.user_import_max_errors:
+            self.errors.append({"row": row, "errors": errors})
+
+
+###########################################
+# Streaming parsers
+###########################################
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 chunks into lines without holding more than one partial line."""
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, Any]]:
+    """(row number, decoded object or JSONDecodeError) per non-blank line."""
+
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            yield row, json.loads(line)
+        except json.JSONDecodeError as ex:
+            yield row, ex
+
+
+async def iter_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, Any]]:
+    """(row number, dict keyed by the header row or csv.Error) per record; empty cells are dropped."""
+
+    header: Optional[list[str]] = None
+    record = ""
+    row = 0
+
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        # A quoted field spanning lines leaves an odd number of quotes until it closes
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as ex:
+            values = ex
+        record = ""
+
+        if header is None:
+            if isinstance(values, csv.Error):
+                raise ValueError(f"Unreadable CSV header: {values}")
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if isinstance(values, csv.Error):
+            yield row, values
+        else:
+            yield row, {name: value for name, value in zip(header, values) if value != ""}
+
+    if record:
+        row += 1
+        yield row, csv.Error("Unterminated quoted field")
+
+
+###########################################
+# Loading
+###########################################
+def _staging_sql() -> str:
+    return f"""
+        CREATE TEMPORARY TABLE IF NOT EXISTS {_STAGING_TABLE} (
+            row_number bigint NOT NULL,
+            id uuid NOT NULL,
+            tenant_id uuid,
+            email text NOT NULL,
+            email_verified boolean NOT NULL,
+            phone text,
+            status text NOT NULL
+        ) ON COMMIT DELETE ROWS
+    """
+
+
+def _upsert_sql() -> str:
+    schema = settings.postgres_db_schema
+    # DISTINCT ON keeps the last occurrence of an email within the chunk; ON CONFLICT cannot touch a row twice.
+    # Importing a soft-deleted user's email restores that user; the CTE sees the rows as they were before the upsert.
+    return f"""
+        WITH deleted AS (
+            SELECT u.id FROM {schema}.users u JOIN {_STAGING_TABLE} s ON s.email = u.email
+            WHERE u.deleted_at IS NOT NULL
+        )
+        INSERT INTO {schema}.users AS u (id, tenant_id, email, email_verified, phone, status)
+        SELECT DISTINCT ON (email) id, tenant_id, email, email_verified, phone, status::{schema}.user_status
+        FROM {_STAGING_TABLE}
+        ORDER BY email, row_number DESC
+        ON CONFLICT (email) DO UPDATE SET
+            tenant_id = COALESCE(EXCLUDED.tenant_id, u.tenant_id),
+            email_verified = EXCLUDED.email_verified,
+            phone = COALESCE(EXCLUDED.phone, u.phone),
+            status = EXCLUDED.status,
+            deleted_at = NULL,
+            updated_at = now()
+        RETURNING (xmax = 0) AS inserted, u.id IN (SELECT id FROM deleted) AS restored, u.id, u.email
+    """
+
+
+class UserImporter:
+    """
+    Loads users in chunks: validate, COPY into a temporary staging table, then one set-based
+    upsert on email per chunk. Each chunk commits on its own; a chunk the database rejects is
+    split and retried until only the offending rows fail. Memory is bounded by the chunk size.
+    Rows a chunk touched are dropped from the user cache once it commits.
+    """
+
+    def __init__(self, engine: AsyncEngine, chunk_size: int, tenant_id: Optional[UUID] = None) -> None:
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be greater than 0")
+
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.tenant_id = tenant_id
+
+    async def run(self, rows: AsyncIterable[tuple[int, Any]]) -> UserImportResult:
+        result = UserImportResult()
+
+        async with self.engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver = raw_connection.driver_connection
+            await driver.execute(_staging_sql())
+            upsert = _upsert_sql()
+
+            try:
+                chunk: list[tuple] = []
+                async for row_number, raw in rows:
+                    result.received += 1
+                    record = self._validate(row_number, raw, result)
+                    if record is not None:
+                        chunk.append(record)
+                    if len(chunk) >= self.chunk_size:
+                        await self._load(driver, upsert, chunk, result)
+                        chunk = []
+
+                if chunk:
+                    await self._load(driver, upsert, chunk, result)
+            finally:
+                await driver.execute(f"DROP TABLE IF EXISTS {_STAGING_TABLE}")
+
+        _logger.info(
+            "User import finished: %s received, %s inserted, %s updated (%s restored), %s failed",
+            result.received,
+            result.inserted,
+            result.updated,
+            result.restored,
+            result.failed,
+        )
+        return result
+
+    def _validate(self, row_number: int, raw: Any, result: UserImportResult) -> Optional[tuple]:
+        if isinstance(raw, Exception):
+            result.add_error(row_number, [{"msg": str(raw)}])
+            return None
+
+        try:
+            user = UserImportRow.model_validate(raw)
+        except ValidationError as ex:
+            result.add_error(row_number, ex.errors(include_url=False, include_context=False, include_input=False))
+            return None
+
+        return (
+            row_number,
+            uuid7(),
+            user.tenant_id or self.tenant_id,
+            user.email,
+            user.email_verified,
+            user.phone,
+            user.status.value,
+        )
+
+    async def _load(self, driver, upsert: str, chunk: list[tuple], result: UserImportResult) -> None:
+        try:
+            async with driver.transaction():
+                await driver.copy_records_to_table(_STAGING_TABLE, records=chunk, columns=_STAGING_COLUMNS)
+                outcomes = await driver.fetch(upsert)
+        except Exception as ex:
+            # Retry each half until the rows the database rejects are isolated; the rest still load.
+            # A lost connection fails every retry, so the chunk is reported as it is.
+            if len(chunk) > 1 and not driver.is_closed():
+                middle = len(chunk) // 2
+                await self._load(driver, upsert, chunk[:middle], result)
+                await self._load(driver, upsert, chunk[middle:], result)
+                return
+
+            _logger.warning("User import rejected %s rows starting at row %s: %s", len(chunk), chunk[0][0], ex)
+            for record in chunk:
+                result.add_error(record[0], [{"msg": f"Rejected by the database: {ex}"}])
+            return
+
+        inserted = sum(1 for outcome in outcomes if outcome["inserted"])
+        result.inserted += inserted
+        result.updated += len(outcomes) - inserted
+        result.restored += sum(1 for outcome in outcomes if outcome["restored"])
+        result.duplicates += len(chunk) - len(outcomes)
+
+        # New rows may replace cached misses for their email, updated ones cached copies
+        await user_cache.invalidate_many((outcome["id"], outcome["email"]) for outcome in outcomes)
+
+
+# Parse and load a byte stream in the given format
+async def import_users(
+    engine: AsyncEngine,
+    chunks: AsyncIterable[bytes],
+    format: ImportFormat,
+    tenant_id: Optional[UUID] = None,
+) -> UserImportResult:
+    rows = iter_csv(chunks) if format == ImportFormat.CSV else iter_ndjson(chunks)
+    return await UserImporter(engine, settings.user_import_chunk_size, tenant_id).run(rows)
+
+
+__all__ = ["ImportFormat", "import_users", "iter_csv", "iter_lines", "iter_ndjson", "UserImporter", "UserImportResult"]
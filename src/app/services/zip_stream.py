@@ -0,0 +1,48 @@
+import io
+import time
+import zipfile
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink; zipfile falls back to data descriptors for it."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Build a ZIP archive incrementally.
+    Each `add` returns the bytes produced so far, so only one entry is ever held in memory.
+    """
+
+    def __init__(self) -> None:
+        self._sink = _ChunkSink()
+        self._archive = zipfile.ZipFile(self._sink, mode="w")
+
+    def add(self, name: str, payload: bytes, compress: bool = True) -> bytes:
+        entry = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        entry.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._archive.writestr(entry, payload)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the remaining bytes."""
+
+        self._archive.close()
+        return self._sink.drain()
+
+
+__all__ = ["ZipStreamWriter"]
@@ -2,9 +2,14 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 from fastapi import FastAPI
 
-from src.app.core.logger import get_logger, setup_logger
+from src.app.core.logger import get_logger, setup_logger, start_log_listener, stop_log_listener
+from src.app.core.cache import close_cache, start_cache
 from src.app.core.config import settings
-from src.app.core.db import dispose_engine
+from src.app.core.db import database_prober, dispose_engine, replica_router
+from src.app.core.executor import render_executor
+from src.app.core.serialization import PrecompiledJSONResponse
+from src.app.core.loop_monitor import loop_monitor
+from src.app.services.qr_service import preload_watermark
 
 
 # async def create_tables() -> None:
@@ -18,14 +23,25 @@ _logger = get_logger(__name__)
 
 @asynccontextmanager
 async def _lifespan(app: FastAPI) -> AsyncGenerator:
+    start_log_listener()
+    loop_monitor.start()
+
     _logger.info("Starting up %s v%s", settings.app_name, settings.app_version)
 
     # TODO: OTEL logging integration
 
-    # TODO: Cache integration
+    # Connects the configured backend; an unreachable server degrades to uncached reads
+    await start_cache()
 
     # TODO: Queue integration
 
+    # Workers decode the watermark once instead of on every render
+    render_executor.start(initializer=preload_watermark, initargs=(settings.qr_watermark_path,))
+
+    # Health endpoints answer from the prober's latest result
+    database_prober.start()
+    replica_router.start()
+
     try:
 
         yield
@@ -33,16 +49,46 @@ async def _lifespan(app: FastAPI) -> AsyncGenerator:
     finally:
         _logger.info("Shutting down application")
 
+        await replica_router.stop()
+        await database_prober.stop()
+        await render_executor.shutdown()
+        await loop_monitor.stop()
+        await close_cache()
         await dispose_engine()
 
         _logger.verbose("Shutdown complete")
 
+        # Flush queued records last so shutdown messages are not lost
+        stop_log_listener()
+
     return
 
 
 def _configure_middleware(app):
     from fastapi.middleware.cors import CORSMiddleware
 
+    from src.app.middleware import AdmissionControlMiddleware, ResponseCacheMiddleware
+
+    # Innermost of the stack but still ahead of routing; rejections get CORS and timing headers
+    if settings.admission_enabled:
+        _logger.debug("Configuring admission control middleware")
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            monitor=loop_monitor,
+            max_loop_lag=settings.admission_max_loop_lag_ms / 1000 if settings.admission_max_loop_lag_ms else None,
+            group_limits=settings.admission_group_limits,
+            default_limit=settings.admission_default_limit,
+            exempt_paths=settings.admission_exempt_paths,
+            retry_after=settings.admission_retry_after,
+        )
+
+    # Inside CORS so stored responses carry no per-origin headers; hits skip admission and routing
+    if settings.response_cache_enabled:
+        from src.app.core.response_cache import response_cache
+
+        _logger.debug("Configuring response cache middleware")
+        app.add_middleware(ResponseCacheMiddleware, cache=response_cache, max_entry_bytes=settings.response_cache_max_entry_bytes)
+
     _logger.debug("Configuring CORS middleware")
     app.add_middleware(
         CORSMiddleware,
@@ -52,10 +98,22 @@ def _configure_middleware(app):
         allow_headers=settings.cors_allow_headers,
     )
 
-    from src.app.middleware import ProcessTimeMiddleware
+    from src.app.middleware import CompressionMiddleware, ProcessTimeMiddleware
+
+    if settings.compression_enabled:
+        _logger.debug("Configuring compression middleware")
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            zstd_level=settings.compression_zstd_level,
+            content_types=settings.compression_content_types,
+            cache_max_entries=settings.compression_cache_max_entries,
+            cache_max_bytes=settings.compression_cache_max_bytes,
+        )
 
     _logger.debug("Configuring custom middleware")
-    app.add_middleware(ProcessTimeMiddleware)
+    app.add_middleware(ProcessTimeMiddleware, server_timing=settings.app_server_timing)
 
 
 def _configure_routes(app):
@@ -75,6 +133,7 @@ def create_app():
         version=settings.app_version,
         root_path=settings.app_root_path,
         lifespan=_lifespan,
+        default_response_class=PrecompiledJSONResponse,
     )
 
     _configure_middleware(app)
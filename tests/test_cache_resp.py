@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from src.app.core.cache import Cache, cached, LocalCacheServer, RespBackend
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _with_server(test):
+    server = LocalCacheServer()
+    await server.start()
+    backend = RespBackend(server.url, pool_size=2, timeout=1.0)
+    try:
+        await backend.connect()
+        await test(server, backend)
+    finally:
+        await backend.close()
+        await server.stop()
+
+
+def test_resp_backend_round_trips():
+    async def test(server, backend):
+        await backend.set("a", b"1")
+        await backend.set_many({"b": b"\x00binary\r\n", "c": b""})
+        assert await backend.get("a") == b"1"
+        assert await backend.get_many(["a", "b", "c", "missing"]) == [b"1", b"\x00binary\r\n", b"", None]
+
+        await backend.delete("a", "missing")
+        assert await backend.get("a") is None
+        assert server.commands > 0
+
+    run(_with_server(test))
+
+
+def test_resp_backend_expires_entries():
+    async def test(server, backend):
+        await backend.set("short", b"x", ttl=0.05)
+        assert await backend.get("short") == b"x"
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+
+    run(_with_server(test))
+
+
+def test_cache_tags_over_resp():
+    async def test(server, backend):
+        users = Cache(backend, "users")
+        pages = Cache(backend, "pages")
+        await users.set("1", {"name": "a"}, tags=["user:1"])
+        await pages.set("home", ["1"], tags=["user:1"])
+        assert await users.get("1") == {"name": "a"}
+
+        await users.invalidate_tags("user:1")
+        assert await users.get("1") is None
+        assert await pages.get("home") is None
+
+    run(_with_server(test))
+
+
+def test_stale_entries_refresh_in_the_background():
+    async def test(server, backend):
+        cache = Cache(backend, "swr", default_ttl=0.05, stale_ttl=10)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls)
+
+        assert await cache.get_or_set("k", loader) == 1
+        await asyncio.sleep(0.1)
+        assert await cache.get_or_set("k", loader) == 1
+        await cache.close()
+        assert await cache.get_or_set("k", loader) == 2
+
+    run(_with_server(test))
+
+
+def test_cached_with_ignored_arguments_loads_stale_entries_inline():
+    async def test(server, backend):
+        cache = Cache(backend, "inline", default_ttl=0.05, stale_ttl=10)
+        sessions = []
+
+        @cached("inline", ignore=["session"], cache=cache)
+        async def load(id: int, session: object) -> int:
+            sessions.append(session)
+            return len(sessions)
+
+        assert await load(1, "first") == 1
+        await asyncio.sleep(0.1)
+        # Served by the caller's own load, never a background refresh holding an old session
+        assert await load(1, "second") == 2
+        await cache.close()
+        assert sessions == ["first", "second"]
+
+    run(_with_server(test))
+
+
+def test_cached_refuses_background_refresh_with_ignored_arguments():
+    with pytest.raises(ValueError):
+        cached("refused", ignore=["session"], stale_while_revalidate=True)
+
+
+def test_unreachable_server_degrades_to_misses():
+    async def test():
+        server = LocalCacheServer()
+        await server.start()
+        url = server.url
+        await server.stop()
+
+        cache = Cache(RespBackend(url, timeout=0.2), "down")
+        await cache.set("k", 1)
+        assert await cache.get("k", default="miss") == "miss"
+
+    run(test())
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from src.app.api.v1.qr_generator import _iter_json_array_items, QRRequestBody
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _split(body: bytes, chunk_size: int) -> list:
+    chunks = [body[start : start + chunk_size] for start in range(0, len(body), chunk_size)]
+
+    async def rest():
+        for chunk in chunks[1:]:
+            yield chunk
+
+    return [item async for item in _iter_json_array_items(chunks[0], rest())]
+
+
+def _every_chunk_size(body: bytes) -> list[list]:
+    return [run(_split(body, size)) for size in range(1, len(body) + 1)]
+
+
+BODY = json.dumps(
+    [
+        {"url": "https://example.com/?q=[1,2]&x={y}", "size": 4},
+        {"url": 'quote " and backslash \\ and escaped \\" inside', "fillColor": "#000000"},
+        {"url": "nested", "format": None, "backgroundColor": "#ffffff"},
+        {"url": "unicode é中 \U0001f600", "size": 50},
+        {},
+    ],
+    indent=1,
+    ensure_ascii=False,
+).encode()
+
+
+def test_every_chunk_size_splits_the_same_elements():
+    expected = [(index, QRRequestBody.model_validate(item)) for index, item in enumerate(json.loads(BODY))]
+
+    for items in _every_chunk_size(BODY):
+        assert items == expected
+
+
+def test_invalid_elements_are_reported_in_place():
+    body = b'[{"size": 0}, {"url": "ok"}, [1, {"a": "]"}], "x"]'
+
+    for items in _every_chunk_size(body):
+        assert [index for index, _ in items] == [0, 1, 2, 3]
+        assert isinstance(items[1][1], QRRequestBody)
+        assert all(isinstance(result, list) for index, result in items if index != 1)
+
+
+@pytest.mark.parametrize("body", [b"[]", b"[ ]", b" [\n]\n ", b"[]   \r\n"])
+def test_empty_array(body):
+    for items in _every_chunk_size(body.lstrip()):
+        assert items == []
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        (b"[,]", "empty element"),
+        (b'[{"url": "a"},,{}]', "empty element"),
+        (b'[{"url": "a"},]', "empty element"),
+        (b'[{"url": "a"}, ]', "empty element"),
+        (b'[{"url": "a"}}', "unbalanced brackets"),
+        (b'[{"url": "a"}', "body ended before the closing bracket"),
+        (b'[{"url": "a]"', "body ended before the closing bracket"),
+        (b'[{"url": "a"}]x', "data after the closing bracket"),
+        (b'[{"url": "a"}] \n [{}]', "data after the closing bracket"),
+    ],
+)
+def test_malformed_bodies_end_with_an_error(body, message):
+    for items in _every_chunk_size(body):
+        index, error = items[-1]
+        assert error == f"Malformed JSON array: {message}"
+        # Elements before the fault are still reported
+        assert all(isinstance(result, QRRequestBody) for _, result in items[:-1])
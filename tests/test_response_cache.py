@@ -0,0 +1,192 @@
+import time
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from src.app.core.response_cache import cache_response, CachedResponse, purge_responses, response_cache, ResponseCache
+from src.app.middleware import ResponseCacheMiddleware
+
+calls = {"item": 0, "negotiated": 0, "private": 0, "cookie": 0, "uncached": 0}
+
+app = FastAPI()
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache, max_entry_bytes=1024)
+
+
+@app.head("/items/{id}")
+@app.get("/items/{id}")
+@cache_response(ttl=60, surrogate_keys=("item:{id}",))
+async def get_item(id: int) -> Response:
+    calls["item"] += 1
+    return Response(f"item {id} #{calls['item']}", media_type="text/plain")
+
+
+@app.get("/negotiated")
+@cache_response(ttl=60)
+async def get_negotiated(request: Request) -> Response:
+    calls["negotiated"] += 1
+    media_type = "application/json" if "json" in request.headers.get("accept", "") else "text/plain"
+    return Response(f"{media_type} #{calls['negotiated']}", media_type=media_type, headers={"vary": "Accept"})
+
+
+@app.get("/private")
+@cache_response(ttl=60)
+async def get_private() -> Response:
+    calls["private"] += 1
+    return Response(str(calls["private"]), headers={"cache-control": "private, max-age=60"})
+
+
+@app.get("/cookie")
+@cache_response(ttl=60)
+async def get_cookie() -> Response:
+    calls["cookie"] += 1
+    response = Response(str(calls["cookie"]))
+    response.set_cookie("session", "abc")
+    return response
+
+
+@app.get("/uncached")
+async def get_uncached() -> Response:
+    calls["uncached"] += 1
+    return Response(str(calls["uncached"]))
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    response_cache.clear()
+    for name in calls:
+        calls[name] = 0
+    yield
+    response_cache.clear()
+
+
+def test_hit_after_miss():
+    first = client.get("/items/1")
+    second = client.get("/items/1")
+
+    assert "x-cache" not in first.headers
+    assert second.headers["x-cache"] == "HIT"
+    assert second.text == first.text == "item 1 #1"
+    assert calls["item"] == 1
+
+    # Query parameter order does not split the entry
+    client.get("/items/1?a=1&b=2")
+    assert client.get("/items/1?b=2&a=1").headers["x-cache"] == "HIT"
+
+
+def test_head_is_answered_from_the_get_entry():
+    client.get("/items/1")
+    head = client.head("/items/1")
+
+    assert head.headers["x-cache"] == "HIT"
+    assert head.content == b""
+    assert calls["item"] == 1
+
+
+def test_routes_that_did_not_opt_in_are_not_stored():
+    client.get("/uncached")
+    client.get("/uncached")
+    assert calls["uncached"] == 2
+
+
+def test_vary_accept_variants():
+    text = client.get("/negotiated", headers={"accept": "text/plain"})
+    json = client.get("/negotiated", headers={"accept": "application/json"})
+    assert calls["negotiated"] == 2
+
+    assert client.get("/negotiated", headers={"accept": "text/plain"}).text == text.text
+    assert client.get("/negotiated", headers={"accept": "application/json"}).text == json.text
+    assert calls["negotiated"] == 2
+
+
+def test_if_none_match_returns_304():
+    client.get("/items/1")
+    # Stored entries without an ETag of their own get a content hash
+    etag = client.get("/items/1").headers["etag"]
+    response = client.get("/items/1", headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert client.get("/items/1", headers={"if-none-match": '"other"'}).status_code == 200
+    assert calls["item"] == 1
+
+
+@pytest.mark.parametrize("headers", [{"authorization": "Bearer token"}, {"range": "bytes=0-1"}])
+def test_authorization_and_range_bypass(headers):
+    client.get("/items/1")
+    response = client.get("/items/1", headers=headers)
+
+    assert "x-cache" not in response.headers
+    assert calls["item"] == 2
+    # A bypassed request does not replace the shared entry
+    assert client.get("/items/1").text == "item 1 #1"
+
+
+@pytest.mark.parametrize("path", ["/private", "/cookie"])
+def test_private_and_set_cookie_responses_are_not_stored(path):
+    client.get(path)
+    client.get(path)
+    assert calls[path.strip("/")] == 2
+    assert len(response_cache) == 0
+
+
+def test_purge_responses():
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert purge_responses("item:1") == 1
+    assert client.get("/items/1").text == "item 1 #3"
+    assert client.get("/items/2").headers["x-cache"] == "HIT"
+
+
+def test_request_cache_control():
+    client.get("/items/1")
+
+    # no-cache revalidates with the app and stores the fresh response
+    assert client.get("/items/1", headers={"cache-control": "no-cache"}).text == "item 1 #2"
+    assert client.get("/items/1").text == "item 1 #2"
+
+    # An entry older than the request's max-age is refetched
+    assert client.get("/items/1", headers={"cache-control": "max-age=60"}).headers["x-cache"] == "HIT"
+    time.sleep(1.1)
+    assert client.get("/items/1", headers={"cache-control": "max-age=1"}).text == "item 1 #3"
+
+    # no-store bypasses the cache entirely
+    assert client.get("/items/1", headers={"cache-control": "no-store"}).text == "item 1 #4"
+    assert client.get("/items/1").text == "item 1 #3"
+
+
+def _entry(body: bytes) -> CachedResponse:
+    now = time.monotonic()
+    return CachedResponse(status=200, headers=[], body=body, etag=None, stored_at=now, expires_at=now + 60)
+
+
+def test_eviction_by_entries():
+    cache = ResponseCache(max_entries=2, max_bytes=1024 * 1024)
+    headers = Headers()
+    for url in ("/a", "/b"):
+        cache.put(url, (), headers, _entry(b"x"))
+    cache.get("/a", headers)
+    cache.put("/c", (), headers, _entry(b"x"))
+
+    assert len(cache) == 2
+    assert cache.get("/a", headers) is not None
+    assert cache.get("/b", headers) is None
+
+
+def test_eviction_by_bytes():
+    entry_size = _entry(b"x" * 100).size
+    cache = ResponseCache(max_entries=100, max_bytes=entry_size * 2)
+    headers = Headers()
+    for url in ("/a", "/b", "/c"):
+        cache.put(url, (), headers, _entry(b"x" * 100))
+
+    assert len(cache) == 2
+    assert cache.size_bytes == entry_size * 2
+    assert cache.get("/a", headers) is None
+    assert not cache.put("/big", (), headers, _entry(b"x" * entry_size * 2))
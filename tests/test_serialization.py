@@ -0,0 +1,108 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from src.app.core.serialization import dump_json, dump_json_list, PrecompiledJSONResponse, PrecompiledRoute
+from src.app.schemas.base_schema import BaseSchema
+
+
+class Item(BaseSchema):
+    item_id: int
+    display_name: str
+
+
+class SecretItem(Item):
+    password_hash: str
+
+
+def _app(route_class: type[APIRoute]) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/item", response_model=Item)
+    async def get_item():
+        return Item(item_id=1, display_name="one")
+
+    @router.get("/secret", response_model=Item)
+    async def get_secret():
+        return SecretItem(item_id=2, display_name="two", password_hash="x")
+
+    @router.get("/dict", response_model=Item)
+    async def get_dict():
+        return {"item_id": 3, "display_name": "three", "password_hash": "x"}
+
+    @router.get("/items", response_model=list[Item])
+    async def get_items():
+        return [Item(item_id=4, display_name="four"), Item(item_id=5, display_name="five")]
+
+    @router.get("/mixed", response_model=list[Item])
+    async def get_mixed():
+        return [Item(item_id=6, display_name="six"), SecretItem(item_id=7, display_name="seven", password_hash="x")]
+
+    app = FastAPI(default_response_class=PrecompiledJSONResponse)
+    app.include_router(router)
+    return app
+
+
+client = TestClient(_app(PrecompiledRoute))
+
+
+@pytest.fixture
+def validations(monkeypatch) -> list:
+    """Response values FastAPI's response field was asked to validate."""
+
+    route = next(route for route in client.app.routes if getattr(route, "path", None) == "/item")
+    field_class = type(route.secure_cloned_response_field)
+    original = field_class.validate
+    calls = []
+
+    def validate(self, value, *args, **kwargs):
+        calls.append(value)
+        return original(self, value, *args, **kwargs)
+
+    monkeypatch.setattr(field_class, "validate", validate)
+    return calls
+
+
+def _get(path: str, app_client: TestClient = client):
+    response = app_client.get(path)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_model_is_serialized_by_alias_without_validation(validations):
+    assert _get("/item") == {"itemId": 1, "displayName": "one"}
+    assert validations == []
+
+    # FastAPI's own route validates the same value
+    assert _get("/item", TestClient(_app(APIRoute))) == {"itemId": 1, "displayName": "one"}
+    assert len(validations) == 1
+
+
+def test_subclass_instance_is_reduced_to_the_declared_model(validations):
+    assert _get("/secret") == {"itemId": 2, "displayName": "two"}
+    assert len(validations) == 1
+
+
+def test_untrusted_values_are_validated(validations):
+    assert _get("/dict") == {"itemId": 3, "displayName": "three"}
+    assert len(validations) == 1
+
+
+def test_list_models(validations):
+    assert _get("/items") == [{"itemId": 4, "displayName": "four"}, {"itemId": 5, "displayName": "five"}]
+    assert validations == []
+
+    assert _get("/mixed") == [{"itemId": 6, "displayName": "six"}, {"itemId": 7, "displayName": "seven"}]
+    assert len(validations) == 1
+
+
+def test_openapi_matches_the_default_route():
+    assert _app(PrecompiledRoute).openapi() == _app(APIRoute).openapi()
+
+
+def test_dump_json_helpers():
+    item = Item(item_id=8, display_name="eight")
+    assert dump_json(item) == b'{"itemId":8,"displayName":"eight"}'
+    assert dump_json_list([item], Item) == b'[{"itemId":8,"displayName":"eight"}]'
+    assert PrecompiledJSONResponse(dump_json(item)).body == b'{"itemId":8,"displayName":"eight"}'
@@ -0,0 +1,129 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api.dependencies import get_user_reader_repository, get_user_writer_repository
+from src.app.api.v1.user import router
+from src.app.core.config import settings
+from src.app.models.user import UserStatus
+from src.app.repositories import parse_user_etags, user_etag
+from src.app.services.user_cache import user_cache
+
+USER_ID = uuid4()
+UPDATED_AT = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+
+class StubSession:
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+class StubUsers:
+    """UserRepository stand-in holding one user; writes apply the same version check as the SQL."""
+
+    def __init__(self) -> None:
+        self.session = StubSession()
+        self.row = {
+            "id": USER_ID,
+            "email": "user@example.com",
+            "status": UserStatus.ACTIVE,
+            "created_at": UPDATED_AT,
+            "updated_at": UPDATED_AT,
+        }
+
+    async def get(self, id, include_deleted=False):
+        return dict(self.row) if id == USER_ID else None
+
+    async def get_version(self, id):
+        return self.row["updated_at"] if id == USER_ID else None
+
+    async def patch(self, id, changes, versions=None):
+        if id != USER_ID or (versions is not None and self.row["updated_at"] not in versions):
+            return None
+        self.row.update(changes, updated_at=self.row["updated_at"] + timedelta(seconds=1))
+        return dict(self.row)
+
+
+users = StubUsers()
+
+app = FastAPI()
+app.include_router(router)
+app.dependency_overrides[get_user_reader_repository] = lambda: users
+app.dependency_overrides[get_user_writer_repository] = lambda: users
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    users.row.update(email="user@example.com", updated_at=UPDATED_AT)
+    user_cache.clear_local()
+    yield
+    user_cache.clear_local()
+
+
+def test_etag_round_trip():
+    etag = user_etag(USER_ID, UPDATED_AT)
+    other = user_etag(uuid4(), UPDATED_AT + timedelta(seconds=5))
+
+    assert etag.startswith('W/"')
+    assert parse_user_etags(etag, USER_ID) == [UPDATED_AT]
+    # Strong form of the same tag, alongside another user's tag
+    assert parse_user_etags(f"{other}, {etag[2:]}", USER_ID) == [UPDATED_AT]
+    assert parse_user_etags(other, USER_ID) == []
+    assert parse_user_etags("*", USER_ID) == []
+    assert parse_user_etags('W/"not-a-user-tag", "abc.zz"', USER_ID) == []
+
+
+@pytest.mark.parametrize("cache_enabled", [True, False])
+def test_get_answers_if_none_match_with_304(monkeypatch, cache_enabled):
+    monkeypatch.setattr(settings, "user_cache_enabled", cache_enabled)
+
+    response = client.get(f"/user/{USER_ID}")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert etag == user_etag(USER_ID, UPDATED_AT)
+
+    not_modified = client.get(f"/user/{USER_ID}", headers={"if-none-match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    stale = user_etag(USER_ID, UPDATED_AT - timedelta(seconds=1))
+    assert client.get(f"/user/{USER_ID}", headers={"if-none-match": stale}).status_code == 200
+
+
+def test_patch_returns_the_new_etag():
+    etag = user_etag(USER_ID, UPDATED_AT)
+    response = client.patch(f"/user/{USER_ID}", json={"email": "new@example.com"}, headers={"if-match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "new@example.com"
+    assert response.headers["etag"] == user_etag(USER_ID, UPDATED_AT + timedelta(seconds=1))
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.parametrize(
+    "if_match",
+    [
+        user_etag(USER_ID, UPDATED_AT - timedelta(microseconds=1)),
+        user_etag(uuid4(), UPDATED_AT),
+        '"malformed"',
+    ],
+)
+def test_patch_with_a_stale_or_foreign_if_match_is_412(if_match):
+    response = client.patch(f"/user/{USER_ID}", json={"email": "new@example.com"}, headers={"if-match": if_match})
+
+    assert response.status_code == 412
+    assert users.row["email"] == "user@example.com"
+
+
+def test_patch_with_if_match_star_only_requires_the_user():
+    assert client.patch(f"/user/{USER_ID}", json={"phone": "1"}, headers={"if-match": "*"}).status_code == 200
+    assert client.patch(f"/user/{uuid4()}", json={"phone": "1"}, headers={"if-match": "*"}).status_code == 412
+    assert client.patch(f"/user/{uuid4()}", json={"phone": "1"}).status_code == 404
@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from pydantic import ValidationError
+
+from src.app.schemas.user import UserImportRow
+from src.app.services.user_import import UserImporter, UserImportResult
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class RejectingDriver:
+    """asyncpg stand-in whose upsert fails whenever the staged chunk holds a rejected email."""
+
+    def __init__(self, rejected: set[str]) -> None:
+        self.rejected = rejected
+        self.staged: list[tuple] = []
+        self.loaded: list[int] = []
+        self.attempts = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        try:
+            yield
+        finally:
+            self.staged = []
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.staged = list(records)
+
+    async def fetch(self, query):
+        self.attempts += 1
+        bad = [record for record in self.staged if record[3] in self.rejected]
+        if bad:
+            raise ValueError(f'invalid input value for enum user_status: "{bad[0][6]}"')
+        self.loaded.extend(record[0] for record in self.staged)
+        return [{"inserted": True, "restored": False, "id": record[1], "email": record[3]} for record in self.staged]
+
+    def is_closed(self) -> bool:
+        return False
+
+
+def _chunk(count: int) -> list[tuple]:
+    return [(row, row, None, f"user{row}@example.com", False, None, "active") for row in range(1, count + 1)]
+
+
+def test_load_isolates_rows_the_database_rejects():
+    driver = RejectingDriver({"user3@example.com", "user6@example.com"})
+    result = UserImportResult()
+
+    run(UserImporter(engine=None, chunk_size=8)._load(driver, "upsert", _chunk(8), result))
+
+    assert driver.loaded == [1, 2, 4, 5, 7, 8]
+    assert result.inserted == 6
+    assert result.failed == 2
+    assert [error["row"] for error in result.errors] == [3, 6]
+    assert result.errors[0]["errors"] == [{"msg": 'Rejected by the database: invalid input value for enum user_status: "active"'}]
+
+
+def test_load_reports_the_whole_chunk_once_the_connection_is_gone():
+    driver = RejectingDriver({"user1@example.com"})
+    driver.is_closed = lambda: True
+    result = UserImportResult()
+
+    run(UserImporter(engine=None, chunk_size=4)._load(driver, "upsert", _chunk(4), result))
+
+    assert driver.attempts == 1
+    assert result.failed == 4
+
+
+def test_import_row_rejects_nul():
+    for field in ("email", "phone"):
+        raw = {"email": "a@example.com", field: "a\x00@example.com"}
+        with pytest.raises(ValidationError, match="NUL"):
+            UserImportRow.model_validate(raw)